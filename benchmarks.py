@@ -0,0 +1,246 @@
+"""Benchmarks das operações críticas do modelo
+
+Gera planilhas sintéticas (1k a 1M itens, distribuídos pelos 27 estados) e mede
+padrões interativos (incluir, editar, excluir um item, totais) e em massa
+(reprecificar, carregar, salvar/exportar, lote da linha de comando com 1 e com N
+processos). Os resultados são gravados em JSON
+para comparação entre versões:
+
+    python benchmarks.py --sizes 1000 100000 --output resultados.json
+    python benchmarks.py --compare resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional
+
+from cli import price_files
+from data_model import DataModel
+from tax_calculator import FixedPointConfig, TaxCalculator
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Acima deste tamanho, exportações .csv/.xlsx só rodam com --full (levam minutos)
+SPREADSHEET_LIMIT = 200_000
+
+# Arquivos de entrada do lote (price_files), que dividem entre si os itens da planilha
+BATCH_FILES = 8
+
+def synthetic_items(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Itens de entrada reprodutíveis, com estados distribuídos igualmente"""
+    rng = np.random.default_rng(seed)
+    states = list(DataModel().state_icms_table)
+    return pd.DataFrame({
+        'Descrição': [f'Item sintético {i}' for i in range(rows)],
+        'Valor Unitário de Custo (R$)': rng.uniform(0.5, 5000, rows).round(2),
+        'Quantidade': rng.integers(1, 500, rows).astype(float),
+        'Margem de Lucro Bruto (%)': rng.choice([10.0, 20.0, 30.0, 45.5], rows),
+        'Estado de Destino': np.array(states)[np.arange(rows) % len(states)]
+    })
+
+def synthetic_sheet(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Planilha completa (itens já precificados) com o número de linhas pedido"""
+    return DataModel().price_frame(synthetic_items(rows, seed))
+
+def batch_inputs(rows: int, workdir: str) -> List[str]:
+    """BATCH_FILES arquivos CSV com rows itens no total, criados uma única vez"""
+    directory = os.path.join(workdir, f'lote_{rows}')
+    paths = [os.path.join(directory, f'cotacao_{i}.csv') for i in range(BATCH_FILES)]
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+        for seed, path in enumerate(paths):
+            synthetic_items(max(1, rows // BATCH_FILES), seed).to_csv(path, index=False)
+    return paths
+
+def model_with(sheet: pd.DataFrame, lazy_derived: bool = False) -> DataModel:
+    model = DataModel(lazy_derived)
+    model.replace_data(sheet.copy())
+    return model
+
+def measure(run: Callable[..., object], setup: Optional[Callable[[], tuple]] = None,
+            repeat: int = 5) -> List[float]:
+    """Executa run(*setup()) repeat vezes; apenas run entra na medição"""
+    timings = []
+    for _ in range(repeat):
+        arguments = setup() if setup else ()
+        start = time.perf_counter()
+        run(*arguments)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def sheet_cases(rows: int, sheet: pd.DataFrame, workdir: str, full: bool,
+                lazy_derived: bool = False) -> Dict[str, tuple]:
+    """Casos para uma planilha de rows itens: nome -> (run, setup)"""
+    rng = np.random.default_rng(rows)
+    item = synthetic_items(1).iloc[0].to_dict()
+    states = list(DataModel().state_icms_table)
+    model = model_with(sheet, lazy_derived)
+    items = synthetic_items(rows)
+    
+    def fresh() -> tuple:
+        return (model_with(sheet, lazy_derived),)
+    
+    def random_row() -> tuple:
+        return (model, int(rng.integers(rows)))
+    
+    def bulk_delete() -> tuple:
+        fresh_model = model_with(sheet, lazy_derived)
+        return (fresh_model, list(range(0, rows, 10)))
+    
+    def deleted() -> tuple:
+        fresh_model = model_with(sheet, lazy_derived)
+        fresh_model.delete_items(list(range(0, rows, 10)))
+        return (fresh_model,)
+    
+    def changed_table() -> tuple:
+        fresh_model = model_with(sheet, lazy_derived)
+        fresh_model.set_icms_table({state: rate + 1 for state, rate in fresh_model.state_icms_table.items()})
+        return (fresh_model,)
+    
+    cases = {
+        'calculate_taxes_frame': (lambda: TaxCalculator.calculate_taxes_frame(sheet, model.tax_config), None),
+        'calculate_taxes_fixed': (lambda: TaxCalculator.calculate_taxes_frame(sheet, model.tax_config,
+                                                                              FixedPointConfig()), None),
+        'price_frame': (lambda: model.price_frame(items), None),
+        'add_item': (lambda m: m.add_item(item), lambda: (model,)),
+        'add_item+consolidate': (lambda m: (m.add_item(item), m.data), lambda: (model,)),
+        'update_item': (lambda m, row: m.update_item(row, 'Quantidade', 7.0), random_row),
+        'update_item_state': (lambda m, row: m.update_item(row, 'Estado de Destino', states[row % 27]), random_row),
+        'delete_item': (lambda m, row: m.delete_items([row]), lambda: (model_with(sheet, lazy_derived), int(rng.integers(rows)))),
+        'delete_items_10pct': (lambda m, rows_: m.delete_items(rows_), bulk_delete),
+        'undo_delete_10pct': (lambda m: m.undo(), deleted),
+        'get_rows_window': (lambda m, row: m.get_rows(row, row + 40), random_row),
+        'calculate_totals': (lambda: model.calculate_totals(), None),
+        'calculate_totals_verify': (lambda: model.calculate_totals(verify=True), None),
+        'update_column_all': (lambda m: m.update_column('Margem de Lucro Bruto (%)', 35.0), fresh),
+        'reprice_icms_all': (lambda m: m.reprice_icms(), changed_table),
+    }
+    
+    # Lote com um processo e com um por núcleo: a razão entre os dois mede o paralelismo
+    batch_output = os.path.join(workdir, f'lote_{rows}_saida')
+    batch_format = '.parquet' if DataModel.project_format_available() else '.csv'
+    for workers in (1, max(2, os.cpu_count() or 1)):
+        cases[f'price_files_workers{workers}'] = (
+            lambda paths, workers=workers: price_files(model, paths, batch_output, batch_format, workers),
+            lambda: (batch_inputs(rows, workdir),)
+        )
+    
+    formats = [DataModel.PROJECT_EXTENSION] if DataModel.project_format_available() else []
+    if full or rows <= SPREADSHEET_LIMIT:
+        formats += ['.csv', '.xlsx']
+    for extension in formats:
+        path = os.path.join(workdir, f'planilha_{rows}{extension}')
+        cases[f'save_to_file{extension}'] = (lambda path=path: model.save_to_file(path), None)
+        cases[f'load_from_file{extension}'] = (lambda m, path=path: m.load_from_file(path), lambda: (DataModel(lazy_derived),))
+    
+    return cases
+
+def environment() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+def record(results: List[Dict[str, object]], name: str, rows: int, timings: List[float]) -> None:
+    result = {
+        'benchmark': name,
+        'rows': rows,
+        'repeat': len(timings),
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings)
+    }
+    results.append(result)
+    print(f"{name:<28} {rows:>9} linhas  mediana {result['median_s'] * 1000:10.3f} ms"
+          f"  mín {result['min_s'] * 1000:10.3f} ms", file=sys.stderr)
+
+def run_benchmarks(sizes: List[int], repeat: int, only: Optional[str] = None,
+                   full: bool = False, lazy_derived: bool = False) -> List[Dict[str, object]]:
+    results: List[Dict[str, object]] = []
+    
+    # Caminho por linha, independente do tamanho da planilha
+    if not only or only in 'calculate_taxes':
+        row = synthetic_sheet(1).iloc[0].to_dict()
+        config = DataModel().tax_config
+        record(results, 'calculate_taxes', 1, measure(lambda: TaxCalculator.calculate_taxes(row, config),
+                                                      repeat=max(repeat, 1000)))
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            sheet = synthetic_sheet(rows)
+            for name, (run, setup) in sheet_cases(rows, sheet, workdir, full, lazy_derived).items():
+                if not only or only in name:
+                    record(results, name, rows, measure(run, setup, repeat))
+            report_batch_scaling(results, rows)
+    
+    return results
+
+def report_batch_scaling(results: List[Dict[str, object]], rows: int) -> None:
+    """Mostra a aceleração do lote com N processos em relação a um único processo"""
+    batch = {r['benchmark']: r['median_s'] for r in results
+             if r['rows'] == rows and r['benchmark'].startswith('price_files_workers')}
+    single = batch.pop('price_files_workers1', None)
+    for name, median in batch.items():
+        workers = int(name[len('price_files_workers'):])
+        speedup = single / median if single and median else 0.0
+        print(f"{'price_files':<28} {rows:>9} linhas  aceleração {speedup:5.2f}x com {workers} processos "
+              f"(eficiência {speedup / workers:.0%})", file=sys.stderr)
+
+def compare(results: List[Dict[str, object]], baseline_path: str) -> None:
+    """Mostra a razão entre as medianas atuais e as de um resultado anterior"""
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = {(r['benchmark'], r['rows']): r for r in json.load(handle)['results']}
+    
+    for result in results:
+        previous = baseline.get((result['benchmark'], result['rows']))
+        if previous and previous['median_s'] > 0:
+            ratio = result['median_s'] / previous['median_s']
+            print(f"{result['benchmark']:<28} {result['rows']:>9}  {ratio:6.2f}x", file=sys.stderr)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks das operações do modelo")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Quantidades de itens")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetições por caso (padrão: 5)")
+    parser.add_argument('--only', help="Roda apenas os casos cujo nome contém este texto")
+    parser.add_argument('--full', action='store_true',
+                        help=f"Inclui exportações .csv/.xlsx acima de {SPREADSHEET_LIMIT} itens")
+    parser.add_argument('--lazy', action='store_true',
+                        help="Modelo com colunas derivadas calculadas sob demanda")
+    parser.add_argument('--output', help="Arquivo JSON de resultados (padrão: saída padrão)")
+    parser.add_argument('--compare', help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+    
+    results = run_benchmarks(args.sizes, args.repeat, args.only, args.full, args.lazy)
+    report = {'environment': {**environment(), 'lazy_derived': args.lazy}, 'results': results}
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Benchmarks de renderização da interface (MainView)
+
+Monta a MainView em uma janela Tk oculta, com um controlador substituto que
+não abre diálogos nem diário, e mede atualização completa, atualização de uma
+linha, rolagem e exclusão de itens selecionados. Relata p50/p95 em JSON:
+
+    python benchmarks_ui.py --sizes 1000 100000 --output ui.json
+
+Requer um display; em servidores, use um display virtual (xvfb-run).
+"""
+import argparse
+import json
+import sys
+import time
+import tkinter as tk
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import environment, model_with, synthetic_items, synthetic_sheet
+from data_model import DataModel
+from view import MainView, configure_locale
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+class BenchmarkController:
+    """Substituto do Controller: os comandos da interface não fazem nada"""
+    
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return lambda *args, **kwargs: None
+
+def latencies(run: Callable[[], object], root: tk.Tk, repeat: int) -> List[float]:
+    """Executa run repeat vezes, incluindo o processamento pendente do Tk em cada medição"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        root.update_idletasks()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def view_cases(view: MainView, model: DataModel, rows: int) -> Dict[str, Callable[[], object]]:
+    rng = np.random.default_rng(rows)
+    item = synthetic_items(1).iloc[0].to_dict()
+    
+    def visible_row() -> int:
+        return view.first_row + int(rng.integers(min(view.visible_rows, model.row_count())))
+    
+    def single_row_refresh() -> None:
+        row = visible_row()
+        view.update_row_in_table(row, str(row))
+    
+    def edit_and_apply() -> None:
+        model.update_item(visible_row(), 'Quantidade', float(rng.integers(1, 500)))
+        view.apply_changes()
+    
+    def scroll() -> None:
+        view.scroll_to(int(rng.integers(max(1, model.row_count() - view.visible_rows))))
+    
+    def wheel_step() -> None:
+        view.scroll_to(view.first_row + 3 if view.first_row + 3 < model.row_count() - view.visible_rows else 0)
+    
+    def add_and_apply() -> None:
+        model.add_item(item)
+        view.apply_changes()
+    
+    def delete_selected() -> None:
+        # Mesmo caminho de Controller.delete_selected, sem o diálogo de confirmação
+        view.select_rows(view.first_row + offset for offset in range(3))
+        model.delete_items(view.selected_row_indices())
+        view.apply_changes()
+    
+    return {
+        'update_table': view.update_table,
+        'update_row_in_table': single_row_refresh,
+        'update_item+apply_changes': edit_and_apply,
+        'scroll_to_random': scroll,
+        'scroll_wheel_step': wheel_step,
+        'add_item+apply_changes': add_and_apply,
+        'update_totals_row': view.update_totals_row,
+        'delete_selected': delete_selected,
+    }
+
+def record(results: List[Dict[str, object]], name: str, rows: int, timings: List[float]) -> None:
+    result = {
+        'benchmark': name,
+        'rows': rows,
+        'repeat': len(timings),
+        'p50_s': float(np.percentile(timings, 50)),
+        'p95_s': float(np.percentile(timings, 95)),
+        'max_s': max(timings)
+    }
+    results.append(result)
+    print(f"{name:<28} {rows:>9} linhas  p50 {result['p50_s'] * 1000:9.3f} ms"
+          f"  p95 {result['p95_s'] * 1000:9.3f} ms", file=sys.stderr)
+
+def run_benchmarks(root: tk.Tk, sizes: List[int], repeat: int,
+                   only: Optional[str] = None) -> List[Dict[str, object]]:
+    results: List[Dict[str, object]] = []
+    for rows in sizes:
+        model = model_with(synthetic_sheet(rows))
+        view = MainView(root, model, BenchmarkController())
+        view.update_table()
+        # Processa o layout (e o redimensionamento da tabela) antes de medir
+        root.update()
+        
+        for name, run in view_cases(view, model, rows).items():
+            if not only or only in name:
+                record(results, name, rows, latencies(run, root, repeat))
+        
+        # Cada tamanho começa com uma interface nova
+        for child in root.winfo_children():
+            child.destroy()
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de renderização da MainView")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Quantidades de itens")
+    parser.add_argument('--repeat', type=int, default=50, help="Repetições por caso (padrão: 50)")
+    parser.add_argument('--only', help="Roda apenas os casos cujo nome contém este texto")
+    parser.add_argument('--output', help="Arquivo JSON de resultados (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Erro: sem display disponível ({str(e)}); use um display virtual, ex.: "
+              f"xvfb-run python benchmarks_ui.py", file=sys.stderr)
+        return 1
+    root.withdraw()
+    configure_locale()
+    
+    try:
+        results = run_benchmarks(root, args.sizes, args.repeat, args.only)
+    finally:
+        root.destroy()
+    report = {'environment': environment(), 'results': results}
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""Modo de linha de comando, sem interface gráfica
+
+Uso: python main.py price entrada.csv -o saida.parquet --state SP --margin 30
+     python main.py batch cotacoes/*.csv -d precificados --format .parquet --workers 8
+
+Este módulo não importa tkinter nem configura o locale, para poder rodar em
+servidores e rotinas agendadas.
+"""
+import argparse
+import decimal
+import json
+import os
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+from data_model import UF_CODES, DataModel, XlsxStreamWriter
+from instrumentation import MODEL_OPERATIONS, Instrumentation
+from tax_calculator import FixedPointConfig, ICMSRules, TaxConfig
+
+# Dependência opcional: saídas colunares (.parquet, .feather)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+OUTPUT_EXTENSIONS = ('.csv', '.xlsx', '.parquet', DataModel.PROJECT_EXTENSION)
+
+class CsvStreamWriter:
+    """Grava blocos de linhas em CSV, com cabeçalho apenas no primeiro"""
+    
+    def __init__(self, filepath: str, columns: List[str]):
+        self.columns = list(columns)
+        self.handle = open(filepath, 'w', newline='', encoding='utf-8')
+        self.header = True
+    
+    def write_frame(self, df: pd.DataFrame) -> None:
+        df.reindex(columns=self.columns).to_csv(self.handle, index=False, header=self.header)
+        self.header = False
+    
+    def close(self) -> None:
+        if self.header:
+            pd.DataFrame(columns=self.columns).to_csv(self.handle, index=False)
+        self.handle.close()
+
+class ArrowStreamWriter:
+    """Grava blocos de linhas em Parquet ou Arrow IPC (.feather) com esquema fixo"""
+    
+    def __init__(self, filepath: str, columns: List[str]):
+        if pa is None:
+            raise ValueError("Saídas .parquet e .feather requerem o pacote pyarrow")
+        self.filepath = filepath
+        self.schema = pa.schema([
+            (col, pa.string() if col in ['Descrição', 'Estado de Destino']
+             else pa.int64() if col == 'Item' else pa.float64())
+            for col in columns
+        ])
+        self.writer = None
+    
+    def write_frame(self, df: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        if self.writer is None:
+            if self.filepath.endswith('.parquet'):
+                self.writer = pq.ParquetWriter(self.filepath, self.schema)
+            else:
+                # Sem compressão, como os projetos gravados pela aplicação
+                self.writer = pa.ipc.new_file(self.filepath, self.schema,
+                                              options=pa.ipc.IpcWriteOptions(compression=None))
+        self.writer.write_table(table)
+    
+    def close(self) -> None:
+        if self.writer is None:
+            self.write_frame(pd.DataFrame(columns=self.schema.names))
+        self.writer.close()
+
+def read_input_chunks(model: DataModel, filepath: str, sep: str = ',',
+                      decimal_sep: str = '.') -> Iterator[pd.DataFrame]:
+    """Lê os itens de entrada em blocos de CSV_CHUNK_SIZE linhas
+    
+    CSVs são lidos em fluxo; .xlsx e projetos são lidos por inteiro e entregues
+    nos mesmos blocos. Em todos os formatos só as colunas de entrada, alíquotas e
+    origem do item são lidas, sem completar as ausentes: alíquotas não informadas
+    ficam a cargo de price_frame (tabela de ICMS e configuração de impostos).
+    Linhas de totais gravadas pela aplicação são descartadas.
+    """
+    wanted = set(model.INPUT_COLUMNS) | {f'{tax_name} (%)' for tax_name in vars(model.tax_config)} | {
+        model.ORIGIN_COLUMN
+    }
+    
+    if filepath.endswith('.csv'):
+        chunks = pd.read_csv(filepath, sep=sep, decimal=decimal_sep, chunksize=model.CSV_CHUNK_SIZE,
+                             usecols=lambda col: col in wanted,
+                             dtype={'Descrição': 'str', 'Estado de Destino': 'str', model.ORIGIN_COLUMN: 'str'})
+    else:
+        if filepath.endswith('.xlsx'):
+            df = pd.read_excel(filepath, usecols=lambda col: col in wanted,
+                               dtype={'Descrição': 'str', 'Estado de Destino': 'str', model.ORIGIN_COLUMN: 'str'})
+        elif filepath.endswith(model.PROJECT_EXTENSION):
+            if pa is None:
+                raise ValueError("O formato de projeto requer o pacote pyarrow")
+            with pa.memory_map(filepath, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            df = table.select([col for col in table.column_names if col in wanted]).to_pandas()
+        else:
+            raise ValueError("Formato de arquivo não suportado")
+        chunks = (df.iloc[start:start + model.CSV_CHUNK_SIZE]
+                  for start in range(0, len(df), model.CSV_CHUNK_SIZE))
+    
+    for chunk in chunks:
+        # Colunas ausentes são apontadas por DataModel.price_frame
+        if {'Descrição', 'Estado de Destino'} <= set(chunk.columns):
+            is_total = (chunk['Descrição'] == "TOTAL") & chunk['Estado de Destino'].fillna('').eq('')
+            if is_total.any():
+                chunk = chunk[~is_total]
+        yield chunk
+
+def open_writer(filepath: str, model: DataModel):
+    if filepath.endswith('.csv'):
+        return CsvStreamWriter(filepath, model.columns)
+    if filepath.endswith('.xlsx'):
+        return XlsxStreamWriter(filepath, model.columns)
+    if filepath.endswith(('.parquet', model.PROJECT_EXTENSION)):
+        return ArrowStreamWriter(filepath, model.columns)
+    raise ValueError("Formato de saída não suportado")
+
+def price_file(model: DataModel, input_path: str, output_path: str,
+               state: Optional[str] = None, margin: Optional[float] = None,
+               totals: bool = False, sep: str = ',', decimal_sep: str = '.') -> int:
+    """Precifica os itens de input_path em blocos e grava o resultado em output_path
+    
+    state e margin, se informados, substituem o estado de destino (e o ICMS
+    correspondente) e a margem de todos os itens. Com totals, planilhas .csv e
+    .xlsx recebem a linha de totais ao final. A saída é gravada em um arquivo
+    temporário e só substitui o destino se tudo der certo. Retorna a
+    quantidade de itens precificados.
+    """
+    if not output_path.endswith(OUTPUT_EXTENSIONS):
+        raise ValueError("Formato de saída não suportado")
+    if state is not None and state not in model.state_icms_table:
+        raise ValueError(f"Estado inválido: {state}")
+    
+    root, extension = os.path.splitext(output_path)
+    temp_path = f"{root}.tmp{extension}"
+    priced = 0
+    sums: Dict[str, float] = dict.fromkeys(model.TOTAL_COLUMNS, 0)
+    
+    try:
+        writer = open_writer(temp_path, model)
+        try:
+            for chunk in read_input_chunks(model, input_path, sep, decimal_sep):
+                if state is not None:
+                    chunk = chunk.drop(columns=['ICMS (%)'], errors='ignore').assign(**{'Estado de Destino': state})
+                if margin is not None:
+                    chunk = chunk.assign(**{'Margem de Lucro Bruto (%)': margin})
+                
+                try:
+                    result = model.price_frame(chunk, first_item=priced + 1)
+                except ValueError as e:
+                    raise ValueError(f"{os.path.basename(input_path)}: {str(e)}")
+                writer.write_frame(result)
+                priced += len(result)
+                for col, value in model.column_sums(result).items():
+                    sums[col] += value
+            
+            if totals and extension in ('.csv', '.xlsx') and priced:
+                sums = model.totals_values(sums)
+                total_row = {col: sums.get(col, "") for col in model.columns}
+                total_row.update({'Item': "", 'Descrição': "TOTAL", 'Estado de Destino': "",
+                                  'Margem de Lucro Bruto (%)': ""})
+                writer.write_frame(pd.DataFrame([total_row]))
+        finally:
+            writer.close()
+        
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    return priced
+
+# Modelo de cada processo de trabalho do lote, criado uma única vez por _init_worker
+_worker_model: Optional[DataModel] = None
+
+def _init_worker(tax_config: TaxConfig, state_icms_table: Dict[str, float],
+                 fixed_point: Optional[FixedPointConfig] = None, origin_state: Optional[str] = None,
+                 icms_rules: Optional[ICMSRules] = None) -> None:
+    """Recebe a configuração de impostos e a tabela de ICMS, somente leitura, uma vez por processo"""
+    global _worker_model
+    _worker_model = DataModel()
+    _worker_model.tax_config = tax_config
+    _worker_model.state_icms_table = state_icms_table
+    _worker_model.fixed_point = fixed_point
+    _worker_model.origin_state = origin_state
+    _worker_model.icms_rules = icms_rules or ICMSRules()
+
+def _price_job(input_path: str, output_path: str, options: Dict[str, object]) -> Dict[str, object]:
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = {'input': input_path, 'output': output_path, 'rows': 0, 'seconds': 0.0,
+              'cpu_seconds': 0.0, 'error': None}
+    try:
+        result['rows'] = price_file(_worker_model, input_path, output_path, **options)
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    # Tempo de CPU do processo de trabalho, que executa um arquivo por vez
+    result['cpu_seconds'] = time.process_time() - cpu_start
+    return result
+
+def price_files(model: DataModel, inputs: List[str], output_dir: str, extension: str,
+                workers: Optional[int] = None, **options) -> List[Dict[str, object]]:
+    """Precifica vários arquivos em paralelo, um processo de trabalho por núcleo
+    
+    Cada arquivo gera output_dir/<nome>extension; options são repassadas a
+    price_file. Erros não interrompem o lote: cada arquivo tem seu resultado
+    (itens, segundos, erro), retornados na ordem de inputs.
+    """
+    if extension not in OUTPUT_EXTENSIONS:
+        raise ValueError("Formato de saída não suportado")
+    
+    outputs = [os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + extension)
+               for path in inputs]
+    duplicated = sorted({path for path in outputs if outputs.count(path) > 1})
+    if duplicated:
+        raise ValueError(f"Arquivos de entrada com o mesmo nome: {', '.join(map(os.path.basename, duplicated))}")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    settings = (model.tax_config, model.state_icms_table, model.fixed_point, model.origin_state, model.icms_rules)
+    if workers == 1:
+        _init_worker(*settings)
+        return [_price_job(path, output, options) for path, output in zip(inputs, outputs)]
+    
+    # Maiores primeiro, para que um arquivo grande não fique sozinho no fim do lote
+    def size(path: str) -> int:
+        return os.path.getsize(path) if os.path.exists(path) else 0
+    order = sorted(range(len(inputs)), key=lambda i: size(inputs[i]), reverse=True)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=settings) as pool:
+        futures = {i: pool.submit(_price_job, inputs[i], outputs[i], options) for i in order}
+        return [futures[i].result() for i in range(len(inputs))]
+
+def summarize(results: List[Dict[str, object]], elapsed: float) -> Dict[str, object]:
+    """Resumo de um lote: arquivos, erros, itens e tempos
+    
+    file_seconds soma o tempo de parede de cada arquivo e cpu_seconds o tempo de
+    CPU dos processos de trabalho; a razão entre eles e wall_seconds indica o
+    paralelismo obtido.
+    """
+    rows = sum(result['rows'] for result in results)
+    return {
+        'files': len(results),
+        'failed': sum(1 for result in results if result['error']),
+        'rows': rows,
+        'wall_seconds': elapsed,
+        'file_seconds': sum(result['seconds'] for result in results),
+        'cpu_seconds': sum(result['cpu_seconds'] for result in results),
+        'rows_per_second': rows / elapsed if elapsed else 0.0
+    }
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="Sistema de precificação - venda (modo de linha de comando). "
+                    "Sem argumentos, abre a interface gráfica."
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    # Opções de precificação comuns aos comandos
+    pricing = argparse.ArgumentParser(add_help=False)
+    pricing.add_argument('--state', help="Estado de destino aplicado a todos os itens (ex.: SP)")
+    pricing.add_argument('--margin', type=float, help="Margem de lucro bruto (%%) aplicada a todos os itens")
+    pricing.add_argument('--totals', action='store_true', help="Inclui a linha de totais em saídas .csv/.xlsx")
+    pricing.add_argument('--fixed-point', choices=['line', 'total'],
+                         help="Cálculo em centavos inteiros, arredondando cada linha ou só os totais")
+    pricing.add_argument('--rounding', choices=['half-even', 'half-up'], default='half-even',
+                         help="Arredondamento do cálculo em centavos (padrão: half-even)")
+    pricing.add_argument('--origin', choices=UF_CODES, metavar='UF',
+                         help="Estado de origem: ICMS interestadual (+ DIFAL) no lugar da alíquota interna do destino")
+    pricing.add_argument('--no-difal', action='store_true', help="Com --origin, não soma o DIFAL às vendas interestaduais")
+    pricing.add_argument('--imported', action='store_true', help="Com --origin, mercadoria importada (interestadual de 4%%)")
+    pricing.add_argument('--sep', default=',', help="Separador de colunas do CSV de entrada (padrão: ,)")
+    pricing.add_argument('--decimal', default='.', help="Separador decimal do CSV de entrada (padrão: .)")
+    
+    price = commands.add_parser('price', parents=[pricing], help="Precifica os itens de um arquivo")
+    price.add_argument('input', help="Arquivo de itens (.csv, .xlsx ou projeto .feather)")
+    price.add_argument('-o', '--output', required=True,
+                       help="Arquivo de saída (.csv, .xlsx, .parquet ou .feather)")
+    
+    batch = commands.add_parser('batch', parents=[pricing], help="Precifica vários arquivos em paralelo")
+    batch.add_argument('inputs', nargs='+', help="Arquivos de itens")
+    batch.add_argument('-d', '--output-dir', required=True, help="Pasta dos arquivos precificados")
+    batch.add_argument('--format', default='.csv', choices=OUTPUT_EXTENSIONS,
+                       help="Formato dos arquivos de saída (padrão: .csv)")
+    batch.add_argument('--workers', type=int, default=None,
+                       help="Processos de trabalho (padrão: um por núcleo)")
+    batch.add_argument('--report', help="Grava o relatório do lote em JSON")
+    return parser
+
+def run_batch(args: argparse.Namespace, model: DataModel) -> int:
+    options = {'state': args.state, 'margin': args.margin, 'totals': args.totals,
+               'sep': args.sep, 'decimal_sep': args.decimal}
+    try:
+        start = time.perf_counter()
+        results = price_files(model, args.inputs, args.output_dir, args.format, args.workers, **options)
+        summary = summarize(results, time.perf_counter() - start)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {str(e)}", file=sys.stderr)
+        return 1
+    
+    for result in results:
+        status = f"ERRO: {result['error']}" if result['error'] else f"{result['rows']} item(ns)"
+        print(f"{result['input']}: {status} ({result['seconds']:.2f} s)", file=sys.stderr)
+    print(f"{summary['files']} arquivo(s), {summary['failed']} com erro, {summary['rows']} item(ns) "
+          f"em {summary['wall_seconds']:.2f} s ({summary['rows_per_second']:.0f} itens/s)", file=sys.stderr)
+    
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as handle:
+            json.dump({'summary': summary, 'files': results}, handle, ensure_ascii=False, indent=2)
+    return 1 if summary['failed'] else 0
+
+def run(argv: List[str]) -> int:
+    """Executa um comando; retorna o código de saída do processo"""
+    args = build_parser().parse_args(argv)
+    model = DataModel()
+    if args.fixed_point:
+        rounding = decimal.ROUND_HALF_UP if args.rounding == 'half-up' else decimal.ROUND_HALF_EVEN
+        model.fixed_point = FixedPointConfig(rounding, per_line=args.fixed_point == 'line')
+    model.origin_state = args.origin
+    model.icms_rules = ICMSRules(difal=not args.no_difal, imported=args.imported)
+    if args.command == 'batch':
+        return run_batch(args, model)
+    
+    instrumentation = Instrumentation.from_environment()
+    if instrumentation is not None:
+        instrumentation.attach(model, MODEL_OPERATIONS, 'model')
+    
+    try:
+        start = time.perf_counter()
+        priced = price_file(model, args.input, args.output, state=args.state, margin=args.margin,
+                            totals=args.totals, sep=args.sep, decimal_sep=args.decimal)
+        elapsed = time.perf_counter() - start
+    except (OSError, ValueError) as e:
+        print(f"Erro: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        if instrumentation is not None:
+            print(f"Relatório de desempenho: {instrumentation.write_report()}", file=sys.stderr)
+    
+    print(f"{priced} item(ns) precificado(s) em {elapsed:.2f} s: {args.output}", file=sys.stderr)
+    return 0
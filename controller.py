@@ -0,0 +1,647 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import pandas as pd
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from data_model import ChangeJournal, DataModel, OperationCancelled
+from tax_calculator import FixedPointConfig, ICMSRules
+from formatting import format_number
+from instrumentation import MODEL_OPERATIONS, VIEW_OPERATIONS, Instrumentation
+from view import BatchEditWindow, ICMSEditorWindow, MainView
+
+class Controller:
+    # Intervalo de consulta ao andamento das operações de arquivo em segundo plano
+    IO_POLL_MS = 100
+    
+    # Diário de alterações para recuperação após falhas
+    AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".precificacao", "autosave")
+    JOURNAL_SYNC_MS = 1000
+    
+    # Colunas derivadas calculadas sob demanda (menos memória em planilhas grandes)
+    LAZY_DERIVED_ENV_VAR = 'PRECIFICACAO_SOB_DEMANDA'
+    
+    def __init__(self, root):
+        self.model = DataModel(lazy_derived=os.environ.get(self.LAZY_DERIVED_ENV_VAR, '').strip() == '1')
+        self.io_cancel: Optional[threading.Event] = None
+        self.view = MainView(root, self.model, self)
+        
+        # Diagnóstico de desempenho: variável de ambiente ou Ctrl+Shift+F12
+        self.instrumentation: Optional[Instrumentation] = None
+        instrumentation = Instrumentation.from_environment()
+        if instrumentation is not None:
+            self.start_instrumentation(instrumentation)
+        
+        self.journal: Optional[ChangeJournal] = None
+        self.start_journal()
+        root.protocol("WM_DELETE_WINDOW", self.quit_application)
+    
+    def start_journal(self) -> None:
+        """Recupera uma sessão encerrada por falha, se houver, e passa a registrar as alterações
+        
+        Cada janela registra em um diretório próprio dentro de AUTOSAVE_DIR;
+        apenas diários de sessões que já não estão em execução são oferecidos.
+        """
+        orphans: List[ChangeJournal] = []
+        try:
+            journal = ChangeJournal.new_session(self.AUTOSAVE_DIR)
+            orphans = [orphan for orphan in ChangeJournal.orphaned_sessions(self.AUTOSAVE_DIR)
+                       if orphan.directory != journal.directory]
+            for orphan in [orphan for orphan in orphans if not orphan.has_pending()]:
+                orphans.remove(orphan)
+                orphan.discard()
+            
+            # Uma sessão recuperada por vez; as demais são oferecidas nas próximas aberturas
+            if orphans:
+                orphan = orphans[0]
+                if messagebox.askyesno(
+                        "Recuperar Alterações",
+                        "O programa não foi encerrado corretamente.\nDeseja recuperar as alterações não salvas?"):
+                    replayed = orphan.recover(self.model)
+                    self.view.show_precision(self.model.fixed_point)
+                    self.view.update_table()
+                    self.view.status_bar.config(text=f"Sessão recuperada ({replayed} alteração(ões) reaplicada(s)).")
+                orphans.remove(orphan)
+                orphan.discard()
+            journal.start(self.model)
+        except Exception as e:
+            messagebox.showwarning("Aviso", f"Salvamento automático desativado.\nErro: {str(e)}")
+            self.model.journal = None
+            return
+        finally:
+            for orphan in orphans:
+                orphan.release()
+        
+        self.journal = journal
+        self.view.root.after(self.JOURNAL_SYNC_MS, self.sync_journal)
+    
+    def sync_journal(self) -> None:
+        """Grava em disco as operações pendentes e compacta o diário quando necessário"""
+        try:
+            self.journal.sync()
+            # Falha na gravação do instantâneo em segundo plano (o diário anterior é mantido)
+            error, self.journal.snapshot_error = self.journal.snapshot_error, None
+            if error is not None:
+                self.view.status_bar.config(text=f"Falha no salvamento automático: {str(error)}")
+            # Durante operações de arquivo o modelo está em uso por outra thread
+            if (self.io_cancel is None and not self.journal.snapshot_running()
+                    and self.journal.needs_compaction()):
+                self.journal.snapshot(self.model)
+        except OSError as e:
+            self.view.status_bar.config(text=f"Falha no salvamento automático: {str(e)}")
+        self.view.root.after(self.JOURNAL_SYNC_MS, self.sync_journal)
+    
+    def quit_application(self) -> None:
+        if self.io_cancel is not None and not messagebox.askyesno(
+                "Sair", "Há uma operação de arquivo em andamento. Deseja sair mesmo assim?"):
+            return
+        if self.journal is not None:
+            self.journal.discard()
+        if self.instrumentation is not None:
+            try:
+                self.stop_instrumentation()
+            except OSError:
+                pass  # O relatório é opcional e não deve impedir a saída
+        self.view.root.destroy()
+    
+    def start_instrumentation(self, instrumentation: Instrumentation) -> None:
+        instrumentation.attach(self.model, MODEL_OPERATIONS, 'model')
+        instrumentation.attach(self.view, VIEW_OPERATIONS, 'view')
+        self.instrumentation = instrumentation
+    
+    def stop_instrumentation(self) -> str:
+        """Encerra a instrumentação e grava o relatório; retorna o caminho do resumo"""
+        instrumentation, self.instrumentation = self.instrumentation, None
+        instrumentation.detach()
+        return instrumentation.write_report()
+    
+    def toggle_instrumentation(self) -> None:
+        """Liga/desliga o diagnóstico de desempenho (atalho oculto para o suporte)"""
+        if self.instrumentation is None:
+            self.start_instrumentation(Instrumentation(profile=True))
+            self.view.status_bar.config(text="Diagnóstico de desempenho ativado (Ctrl+Shift+F12 para encerrar).")
+            return
+        
+        try:
+            path = self.stop_instrumentation()
+            self.view.status_bar.config(text=f"Relatório de desempenho gravado em {path}")
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível gravar o relatório de desempenho.\nErro: {str(e)}")
+    
+    def io_busy(self) -> bool:
+        """Indica (e avisa) se há uma operação de arquivo em andamento bloqueando edições"""
+        if self.io_cancel is not None:
+            messagebox.showwarning("Aviso", "Aguarde o término da operação de arquivo em andamento.")
+            return True
+        return False
+    
+    def run_io_job(self, message: str, job: Callable[[Callable[[float], None]], object],
+                   on_success: Callable[[object], None], error_message: str) -> None:
+        """Executa job em uma thread separada, mantendo a interface responsiva
+        
+        O job recebe uma função de progresso; o andamento e o resultado voltam à
+        thread da interface por uma fila consultada com root.after.
+        """
+        cancel = threading.Event()
+        events: queue.Queue = queue.Queue()
+        
+        def progress(fraction: float) -> None:
+            if cancel.is_set():
+                raise OperationCancelled()
+            events.put(('progress', fraction))
+        
+        def worker() -> None:
+            try:
+                events.put(('done', job(progress)))
+            except OperationCancelled:
+                events.put(('cancelled', None))
+            except Exception as e:
+                events.put(('error', e))
+        
+        def poll() -> None:
+            while True:
+                try:
+                    kind, payload = events.get_nowait()
+                except queue.Empty:
+                    self.view.root.after(self.IO_POLL_MS, poll)
+                    return
+                
+                if kind == 'progress':
+                    self.view.set_progress(payload)
+                    continue
+                
+                self.io_cancel = None
+                self.view.hide_progress()
+                if kind == 'done':
+                    try:
+                        on_success(payload)
+                        return
+                    except Exception as e:
+                        # Falha ao aplicar o resultado: tratada como erro do próprio job
+                        payload = e
+                elif kind == 'cancelled':
+                    self.view.status_bar.config(text="Operação cancelada.")
+                    return
+                self.view.status_bar.config(text="Pronto")
+                messagebox.showerror("Erro", f"{error_message}\nErro: {str(payload)}")
+                return
+        
+        self.io_cancel = cancel
+        self.view.show_progress(message)
+        threading.Thread(target=worker, daemon=True).start()
+        self.view.root.after(self.IO_POLL_MS, poll)
+    
+    def cancel_io_job(self) -> None:
+        if self.io_cancel is not None:
+            self.io_cancel.set()
+            self.view.status_bar.config(text="Cancelando...")
+    
+    def add_item(self) -> None:
+        if self.io_busy():
+            return
+        try:
+            item_data = {
+                'Descrição': self.view.input_widgets['description'].get(),
+                'Valor Unitário de Custo (R$)': self.view.input_widgets['unit_cost'].get(),
+                'Quantidade': self.view.input_widgets['quantity'].get(),
+                'Margem de Lucro Bruto (%)': self.view.input_widgets['profit_margin'].get(),
+                'Estado de Destino': self.view.input_widgets['state'].get(),
+                'ICMS (%)': self.view.input_widgets['icms'].get(),
+                'PIS (%)': self.view.input_widgets['pis'].get(),
+                'COFINS (%)': self.view.input_widgets['cofins'].get(),
+                'IRPJ (%)': self.view.input_widgets['irpj'].get(),
+                'CSLL (%)': self.view.input_widgets['csll'].get()
+            }
+            
+            self.model.add_item(item_data)
+            self.view.apply_changes()
+            
+            # Limpar campos após adição
+            self.view.input_widgets['description'].delete(0, tk.END)
+            self.view.input_widgets['unit_cost'].delete(0, tk.END)
+            self.view.input_widgets['unit_cost'].insert(0, "1,00")
+            self.view.input_widgets['quantity'].delete(0, tk.END)
+            self.view.input_widgets['quantity'].insert(0, "1,00")
+            
+            self.view.status_bar.config(text="Item adicionado com sucesso!")
+            
+        except ValueError as e:
+            messagebox.showerror("Erro", f"Não foi possível adicionar o item:\n{str(e)}")
+    
+    def update_icms_by_state(self, event=None) -> None:
+        state = self.view.input_widgets['state'].get()
+        if state in self.model.state_icms_table:
+            self.view.input_widgets['icms'].delete(0, tk.END)
+            self.view.input_widgets['icms'].insert(0, format_number(self.model.state_rates(state)['ICMS']))
+    
+    def edit_cell(self, event) -> None:
+        if self.io_busy():
+            return
+        item = self.view.tree.identify_row(event.y)
+        column = self.view.tree.identify_column(event.x)
+        
+        # Bloquear edição para linha de totais
+        if 'total' in self.view.tree.item(item, 'tags'):
+            return
+        
+        if not item or column == '#0':
+            return
+        
+        col_name = self.model.columns[int(column[1:])-1]
+        
+        # Impedir edição da coluna 'Item' e das colunas sempre recalculadas
+        if col_name not in self.model.editable_columns:
+            return
+        
+        try:
+            row_index = int(item)
+        except ValueError:
+            return  # Item inválido (ex: linha de totais)
+        
+        try:
+            current_value = self.model.get_rows(row_index, row_index + 1).at[row_index, col_name]
+        except KeyError:
+            return  # Nome de coluna inválido
+        
+        # Criar editor inplace
+        self._create_inplace_editor(item, column, col_name, row_index, current_value)
+        
+    def _create_inplace_editor(self, item, column, col_name, row_index, current_value):
+        # Obtém as coordenadas da célula
+        bbox = self.view.tree.bbox(item, column)
+        if not bbox:
+            return  # Célula não está visível
+        
+        x, y, width, height = bbox
+
+        # Obtém o container pai da Treeview (onde as scrollbars estão)
+        container = self.view.tree.master
+
+        # Cria o editor no container pai
+        if col_name == 'Estado de Destino':
+            entry = ttk.Combobox(
+                container,
+                values=self.model.state_icms_table.keys(),
+                state="readonly"
+            )
+        else:
+            entry = ttk.Entry(container)
+
+        entry.place(x=x, y=y, width=width, height=height)
+
+        # Configura valor inicial e foco
+        if isinstance(current_value, (float, int)) and col_name != 'Item':
+            display_value = format_number(current_value)
+        else:
+            display_value = str(current_value)
+        
+        entry.insert(0, display_value)
+        entry.select_range(0, tk.END)
+        entry.focus()
+
+        def save_edit():
+            try:
+                # O editor pode ter sido aberto antes de uma gravação em outra thread
+                if self.io_busy():
+                    return
+                new_value = entry.get()
+                
+                if col_name in ['Descrição', 'Estado de Destino', 'Item']:
+                    pass  # Manter como string
+                else:
+                    new_value = new_value.replace('.', '').replace(',', '.')
+                    new_value = float(new_value)
+                
+                # Estado e ICMS correspondente são desfeitos juntos
+                self.model.begin_group()
+                try:
+                    self.model.update_item(row_index, col_name, new_value)
+                    
+                    if col_name == 'Estado de Destino':
+                        self.model.update_item(row_index, 'ICMS (%)', self.model.state_rates(new_value)['ICMS'])
+                finally:
+                    self.model.end_group()
+                
+                self.view.apply_changes()
+                self.view.status_bar.config(text="Item atualizado com sucesso!")
+                
+            except ValueError as e:
+                messagebox.showerror("Erro", f"Valor inválido: {str(e)}")
+            finally:
+                entry.destroy()
+
+        entry.bind("<FocusOut>", lambda e: save_edit())
+        entry.bind("<Return>", lambda e: save_edit())
+
+    def batch_edit(self) -> None:
+        if self.io_busy():
+            return
+        BatchEditWindow(
+            self.view.root,
+            self.model.editable_columns,
+            self.view.brazilian_states,
+            len(self.view.selected_rows),
+            self.apply_batch_edit
+        )
+    
+    def apply_batch_edit(self, column: str, new_value: str, target: str,
+                         where: Optional[Dict[str, str]] = None) -> bool:
+        if self.io_busy():
+            return False
+        indices = None
+        if target == "selection":
+            indices = self.view.selected_row_indices()
+        
+        self.model.begin_group()
+        try:
+            rows = self.model.update_column(column, new_value, indices=indices, where=where)
+            
+            if column == 'Estado de Destino' and rows:
+                self.model.update_column('ICMS (%)', self.model.state_rates(new_value)['ICMS'], indices=rows)
+            
+            self.model.end_group()
+            self.view.apply_changes()
+            self.view.status_bar.config(text=f"{len(rows)} item(ns) atualizado(s) com sucesso!")
+            return True
+            
+        except ValueError as e:
+            self.model.end_group()
+            messagebox.showerror("Erro", f"Valor inválido: {str(e)}")
+            return False
+    
+    def edit_icms_table(self) -> None:
+        if self.io_busy():
+            return
+        ICMSEditorWindow(
+            self.view.root,
+            self.model.state_icms_table,
+            self.update_icms_table,
+            self.model.origin_state,
+            self.model.icms_rules
+        )
+    
+    def change_precision(self) -> None:
+        """Aplica o modo de cálculo escolhido no menu Configurações e reprecifica os itens"""
+        if self.io_busy():
+            self.view.show_precision(self.model.fixed_point)
+            return
+        mode = self.view.precision_mode.get()
+        fixed_point = None if mode == 'float' else FixedPointConfig(self.view.rounding_mode.get(),
+                                                                    per_line=mode == 'line')
+        if fixed_point == self.model.fixed_point:
+            return
+        
+        try:
+            self.model.set_fixed_point(fixed_point)
+        except ValueError as e:
+            messagebox.showerror("Erro", f"Não foi possível alterar a precisão do cálculo:\n{str(e)}")
+            self.view.show_precision(self.model.fixed_point)
+            return
+        self.view.update_table()
+        self.view.status_bar.config(text="Precisão do cálculo alterada; itens reprecificados.")
+    
+    def update_icms_table(self, new_table: Dict[str, float], reprice: bool = False,
+                          origin_state: Optional[str] = None, rules: Optional[ICMSRules] = None) -> bool:
+        """Aplica a tabela de ICMS e, se rules for informado, o estado de origem e as regras
+        
+        Retorna False, mantendo o editor aberto, se uma operação de arquivo estiver em andamento.
+        """
+        if self.io_busy():
+            return False
+        changed_states = [state for state, rate in new_table.items()
+                          if self.model.state_icms_table.get(state) != rate]
+        rules_changed = rules is not None and (origin_state, rules) != (self.model.origin_state,
+                                                                        self.model.icms_rules)
+        
+        # Tabela, regras e reprecificação formam uma única etapa de desfazer
+        self.model.begin_group()
+        try:
+            self.model.set_icms_table(new_table)
+            if rules_changed:
+                self.model.set_icms_rules(origin_state, rules)
+            self.update_icms_by_state()
+            if not reprice:
+                self.view.status_bar.config(text="Tabela de ICMS atualizada com sucesso!")
+                return True
+            
+            # Nova origem ou novas regras podem alterar a alíquota de qualquer destino
+            start = time.perf_counter()
+            changed_rows = self.model.reprice_icms(None if rules_changed else changed_states)
+            elapsed = time.perf_counter() - start
+            
+            self.view.apply_changes()
+            self.view.status_bar.config(
+                text=f"Tabela de ICMS atualizada: {changed_rows} item(ns) reprecificado(s) em {elapsed:.2f} s"
+            )
+        except ValueError as e:
+            messagebox.showerror("Erro", f"Não foi possível reaplicar a tabela de ICMS:\n{str(e)}")
+        finally:
+            self.model.end_group()
+        return True
+    
+    def delete_selected(self) -> None:
+        if self.io_busy():
+            return
+        indices = self.view.selected_row_indices()
+        if not indices:
+            messagebox.showwarning("Aviso", "Nenhum item selecionado para excluir")
+            return
+        
+        if messagebox.askyesno("Confirmar", f"Deseja excluir {len(indices)} item(ns)?"):
+            self.model.delete_items(indices)
+            self.view.apply_changes()  # Isso aciona a atualização automática dos totais
+            self.view.status_bar.config(text=f"{len(indices)} item(ns) excluído(s) com sucesso!")
+    
+    def undo(self) -> None:
+        if self.io_busy():
+            return
+        if self.model.undo():
+            self.after_history_change()
+            self.view.status_bar.config(text="Alteração desfeita.")
+        else:
+            self.view.status_bar.config(text="Nada para desfazer.")
+    
+    def redo(self) -> None:
+        if self.io_busy():
+            return
+        if self.model.redo():
+            self.after_history_change()
+            self.view.status_bar.config(text="Alteração refeita.")
+        else:
+            self.view.status_bar.config(text="Nada para refazer.")
+    
+    def after_history_change(self) -> None:
+        # A tabela de ICMS pode ter mudado junto com os itens
+        self.update_icms_by_state()
+        self.view.apply_changes()
+    
+    def new_file(self) -> None:
+        if self.io_busy():
+            return
+        if not self.model.data.empty:
+            if messagebox.askyesno("Novo Arquivo", "Deseja salvar as alterações antes de criar um novo arquivo?"):
+                self.save_file(on_saved=self._start_new_file)
+                return
+        
+        self._start_new_file()
+    
+    def _start_new_file(self) -> None:
+        self.model.clear_data()
+        self.view.update_table()
+        self.model.current_file = None
+        self.view.status_bar.config(text="Novo arquivo criado.")
+    
+    def open_file(self) -> None:
+        if self.io_busy():
+            return
+        filepath = filedialog.askopenfilename(
+            title="Abrir Arquivo",
+            filetypes=self.open_filetypes(),
+            defaultextension=".xlsx"
+        )
+        
+        if filepath:
+            def on_loaded(df: pd.DataFrame) -> None:
+                self.model.replace_data(df, filepath)
+                self.view.show_precision(self.model.fixed_point)
+                self.view.update_table()
+                self.view.status_bar.config(text=f"Arquivo carregado: {os.path.basename(filepath)}")
+            
+            self.run_io_job(
+                f"Carregando {os.path.basename(filepath)}...",
+                lambda progress: self.model.read_file(filepath, progress),
+                on_loaded,
+                "Não foi possível abrir o arquivo."
+            )
+    
+    def open_filetypes(self) -> List[tuple]:
+        filetypes = [("Arquivos Excel", "*.xlsx"), ("Arquivos CSV", "*.csv"), ("Todos os arquivos", "*.*")]
+        if self.model.project_format_available():
+            filetypes.insert(0, ("Projeto de precificação", f"*{self.model.PROJECT_EXTENSION}"))
+        return filetypes
+    
+    def save_filetypes(self) -> List[tuple]:
+        # Com o formato de projeto disponível, planilhas passam a ser apenas exportadas
+        if self.model.project_format_available():
+            return [("Projeto de precificação", f"*{self.model.PROJECT_EXTENSION}")]
+        return [("Arquivos Excel", "*.xlsx"), ("Arquivos CSV", "*.csv")]
+    
+    def save_file(self, on_saved: Optional[Callable[[], None]] = None) -> None:
+        if self.io_busy():
+            return
+        current_file = self.model.current_file
+        if current_file and current_file.endswith(tuple(pattern[1:] for _, pattern in self.save_filetypes())):
+            self.save_to_file(current_file, on_saved)
+        else:
+            self.save_file_as(on_saved)
+    
+    def save_file_as(self, on_saved: Optional[Callable[[], None]] = None) -> None:
+        if self.io_busy():
+            return
+        filetypes = self.save_filetypes()
+        filepath = filedialog.asksaveasfilename(
+            title="Salvar Como",
+            defaultextension=filetypes[0][1][1:],
+            filetypes=filetypes
+        )
+        
+        if filepath:
+            self.save_to_file(filepath, on_saved)
+    
+    def export_file(self) -> None:
+        if self.io_busy():
+            return
+        filepath = filedialog.asksaveasfilename(
+            title="Exportar Planilha",
+            defaultextension=".xlsx",
+            filetypes=[("Arquivos Excel", "*.xlsx"), ("Arquivos CSV", "*.csv")]
+        )
+        
+        if filepath:
+            self.model.consolidate()
+            self.run_io_job(
+                f"Exportando {os.path.basename(filepath)}...",
+                lambda progress: self.model.export_to_file(filepath, progress),
+                lambda _: self.view.status_bar.config(text=f"Planilha exportada: {os.path.basename(filepath)}"),
+                "Não foi possível exportar a planilha."
+            )
+    
+    def save_to_file(self, filepath: str, on_saved: Optional[Callable[[], None]] = None) -> None:
+        def on_done(_) -> None:
+            self.view.status_bar.config(text=f"Arquivo salvo: {os.path.basename(filepath)}")
+            if on_saved:
+                on_saved()
+        
+        # Consolida inclusões pendentes antes de entregar o modelo à outra thread
+        self.model.consolidate()
+        self.run_io_job(
+            f"Salvando {os.path.basename(filepath)}...",
+            lambda progress: self.model.save_to_file(filepath, progress),
+            on_done,
+            "Não foi possível salvar o arquivo."
+        )
+    
+    def clear_spreadsheet(self) -> None:
+        if self.io_busy() or self.model.data.empty:
+            return
+            
+        if messagebox.askyesno("Limpar Planilha", "Tem certeza que deseja limpar toda a planilha?\nTodos os dados serão perdidos."):
+            self.model.clear_data()
+            self.view.update_table()
+            self.view.status_bar.config(text="Planilha limpa.")
+    
+    def show_help(self) -> None:
+        help_text = """Sistema de precificação - venda
+
+Como usar:
+1. Preencha os campos no painel "Adicionar Item"
+2. Clique em "Adicionar Item" para incluir na planilha
+3. Edite itens clicando duas vezes sobre eles
+4. Calcule totais usando o botão ou F9
+5. Salve sua planilha quando terminar
+
+Atalhos:
+- Ctrl+N: Novo arquivo
+- Ctrl+O: Abrir arquivo
+- Ctrl+S: Salvar arquivo
+- Ctrl+Z / Ctrl+Y: Desfazer / refazer alteração
+- F9: Calcular totais
+- Del: Excluir itens selecionados"""
+        
+        messagebox.showinfo("Ajuda", help_text)
+    
+    def show_about(self) -> None:
+        about_text = """Sistema de precificação - venda
+
+Versão: 2.0 BETA
+Desenvolvido por: Danilo Araujo Mota
+Contato: daniloaraujomota@gmail.com
+Data: 2025
+
+MIT License
+
+Copyright (c) 2025 Danilo Araujo Mota
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+        
+        messagebox.showinfo("Sobre", about_text)
@@ -0,0 +1,1583 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import pickle
+import re
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+from collections import deque
+from dataclasses import asdict, astuple, dataclass, field
+
+from tax_calculator import TAX_NAMES, FixedPointConfig, ICMSRules, TaxCalculator, TaxConfig
+
+# Dependência opcional: formato de projeto colunar (Arrow IPC / Feather)
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+# Trava de arquivo do diário: fcntl em sistemas POSIX, msvcrt no Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class XlsxStreamWriter:
+    """Gravador de .xlsx em fluxo, com memória constante
+    
+    Monta o XML da planilha bloco a bloco com operações vetorizadas sobre as
+    colunas do DataFrame e o grava diretamente no arquivo zip, sem manter a
+    pasta de trabalho em memória. Os formatos numéricos são os internos do Excel.
+    """
+    # Índices em cellXfs de styles.xml
+    STYLE_DEFAULT, STYLE_CURRENCY, STYLE_RATE, STYLE_INTEGER = 0, 1, 2, 3
+    
+    _INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+    
+    _CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    )
+    _ROOT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    )
+    _WORKBOOK = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    )
+    _WORKBOOK_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    # Formatos internos: 4 = "#,##0.00", 2 = "0.00", 1 = "0"
+    _STYLES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="4">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="2" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="1" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    )
+    
+    def __init__(self, filepath: str, columns: List[str]):
+        self.columns = list(columns)
+        self.styles = [self.column_style(col) for col in self.columns]
+        self.next_row = 1
+        self.archive = zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED, compresslevel=1)
+        for name, content in [('[Content_Types].xml', self._CONTENT_TYPES),
+                              ('_rels/.rels', self._ROOT_RELS),
+                              ('xl/workbook.xml', self._WORKBOOK),
+                              ('xl/_rels/workbook.xml.rels', self._WORKBOOK_RELS),
+                              ('xl/styles.xml', self._STYLES)]:
+            self.archive.writestr(name, content)
+        
+        self.sheet = self.archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self.sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                         b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         b'<sheetData>')
+        self.write_frame(pd.DataFrame([self.columns], columns=self.columns), header=True)
+    
+    def __enter__(self) -> 'XlsxStreamWriter':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    @classmethod
+    def column_style(cls, column: str) -> int:
+        if column == 'Item':
+            return cls.STYLE_INTEGER
+        if column.endswith('(%)'):
+            return cls.STYLE_RATE
+        if column.startswith('Valor') or column == 'Quantidade':
+            return cls.STYLE_CURRENCY
+        return cls.STYLE_DEFAULT
+    
+    @classmethod
+    def _cells(cls, values: pd.Series, style: int) -> pd.Series:
+        """XML das células de uma coluna inteira"""
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            cells = f'<c s="{style}"><v>' + values.astype(str) + '</v></c>'
+            return cells.where(np.isfinite(values.to_numpy(dtype=float)), '<c/>')
+        
+        text = (values.astype(str)
+                .str.replace(cls._INVALID_XML_CHARS, '', regex=True)
+                .str.replace('&', '&amp;', regex=False)
+                .str.replace('<', '&lt;', regex=False)
+                .str.replace('>', '&gt;', regex=False))
+        cells = '<c t="inlineStr"><is><t xml:space="preserve">' + text + '</t></is></c>'
+        return cells.where(values.notna(), '<c/>')
+    
+    def write_frame(self, df: pd.DataFrame, header: bool = False) -> None:
+        """Acrescenta as linhas de df à planilha, nas colunas informadas na criação"""
+        if df.empty:
+            return
+        
+        row_numbers = pd.Series(range(self.next_row, self.next_row + len(df)), index=df.index).astype(str)
+        rows = '<row r="' + row_numbers + '">'
+        for col, style in zip(self.columns, self.styles):
+            values = df[col] if col in df.columns else pd.Series(np.nan, index=df.index)
+            rows = rows + self._cells(values.astype(object) if header else values, style)
+        rows = rows + '</row>'
+        
+        self.sheet.write(''.join(rows.tolist()).encode('utf-8'))
+        self.next_row += len(df)
+    
+    def close(self) -> None:
+        if self.sheet is not None:
+            self.sheet.write(b'</sheetData></worksheet>')
+            self.sheet.close()
+            self.sheet = None
+            self.archive.close()
+
+class OperationCancelled(Exception):
+    """Levantada por callbacks de progresso para interromper uma leitura ou gravação"""
+
+@dataclass
+class ChangeSet:
+    """Índices de linhas alterados desde a última sincronização com a visualização"""
+    inserted: Set[int] = field(default_factory=set)
+    updated: Set[int] = field(default_factory=set)
+    deleted: Set[int] = field(default_factory=set)
+    reset: bool = False  # Dados substituídos por completo (carga, limpeza)
+    
+    def __bool__(self) -> bool:
+        return self.reset or bool(self.inserted or self.updated or self.deleted)
+
+# Deltas do histórico de desfazer/refazer: guardam só o trecho afetado, nunca o DataFrame inteiro
+
+@dataclass
+class CellsEdit:
+    """Valores anteriores e novos de um bloco de células (linhas x colunas)"""
+    before: pd.DataFrame
+    after: pd.DataFrame
+
+@dataclass
+class RowsInserted:
+    """Linhas acrescentadas ao final a partir de start; rows é preenchido ao desfazer"""
+    start: int
+    next_item_before: int
+    next_item_after: int
+    rows: Optional[pd.DataFrame] = None
+
+@dataclass
+class RowsDeleted:
+    """Linhas removidas e suas posições originais, em ordem crescente"""
+    positions: np.ndarray
+    rows: pd.DataFrame
+    next_item_before: int
+
+@dataclass
+class DataCleared:
+    """DataFrame descartado por clear_data (sem cópia: o modelo já não o referencia)"""
+    previous: pd.DataFrame
+    next_item_before: int
+
+@dataclass
+class ICMSTableChanged:
+    before: Dict[str, float]
+    after: Dict[str, float]
+
+@dataclass
+class ICMSRulesChanged:
+    # (estado de origem, regras) antes e depois
+    before: tuple
+    after: tuple
+
+@dataclass
+class CompoundEdit:
+    """Operações agrupadas que se desfazem e refazem como uma só"""
+    entries: List[object]
+
+class UndoHistory:
+    """Pilhas de desfazer/refazer com profundidade limitada
+    
+    Ao exceder max_depth, as entradas mais antigas são descartadas. Entre
+    begin_group e end_group, as entradas são reunidas em um CompoundEdit.
+    """
+    
+    def __init__(self, max_depth: int = 100):
+        self.undo_stack: deque = deque(maxlen=max_depth)
+        self.redo_stack: List[object] = []
+        self._group: Optional[List[object]] = None
+        self._group_depth = 0
+    
+    def push(self, entry: object) -> None:
+        if self._group is not None:
+            self._group.append(entry)
+            return
+        self.undo_stack.append(entry)
+        self.redo_stack.clear()
+    
+    def begin_group(self) -> None:
+        if self._group_depth == 0:
+            self._group = []
+        self._group_depth += 1
+    
+    def end_group(self) -> None:
+        self._group_depth -= 1
+        if self._group_depth > 0:
+            return
+        entries, self._group = self._group, None
+        if entries:
+            self.push(entries[0] if len(entries) == 1 else CompoundEdit(entries))
+    
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+    
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+    
+    def clear(self) -> None:
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+# Unidades federativas aceitas em 'Estado de Destino', guardado como categoria
+UF_CODES = ["AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA",
+            "PB", "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO"]
+STATE_DTYPE = pd.CategoricalDtype(UF_CODES)
+STATE_CODES = {state: code for code, state in enumerate(UF_CODES)}
+ICMS_INDEX = TAX_NAMES.index('ICMS')
+
+class DataModel:
+    """Classe responsável por gerenciar os dados da aplicação"""
+    # Colunas somadas na linha de totais
+    TOTAL_COLUMNS = [
+        "Valor Unitário de Custo (R$)", 
+        "Quantidade",
+        "Valor Total de Custo (R$)", 
+        "Valor Total de Venda (R$)",
+        "Valor Total ICMS (R$)",
+        "Valor Total PIS (R$)",
+        "Valor Total COFINS (R$)",
+        "Valor Total IRPJ (R$)",
+        "Valor Total CSLL (R$)",
+        "Valor Total de impostos",
+        "Valor Total"
+    ]
+    
+    # Linhas por bloco na leitura/gravação de arquivos CSV e na exportação .xlsx
+    CSV_CHUNK_SIZE = 50_000
+    XLSX_CHUNK_SIZE = 20_000
+    
+    # Formato nativo de projeto; .xlsx e .csv ficam para importação/exportação
+    PROJECT_EXTENSION = '.feather'
+    PROJECT_METADATA_KEY = b'precificacao'
+    
+    # Operações mantidas no histórico de desfazer/refazer
+    UNDO_DEPTH = 100
+    
+    # Campos informados pelo usuário para cada item; alíquotas são opcionais
+    INPUT_COLUMNS = ['Descrição', 'Valor Unitário de Custo (R$)', 'Quantidade',
+                     'Margem de Lucro Bruto (%)', 'Estado de Destino']
+    
+    # Coluna opcional de entrada em price_frame: origem de cada item (matriz de ICMS)
+    ORIGIN_COLUMN = 'Estado de Origem'
+    
+    # Linhas calculadas por vez no modo de colunas sob demanda (totais, gravação)
+    MATERIALIZE_CHUNK_SIZE = 50_000
+    
+    def __init__(self, lazy_derived: bool = False):
+        self.columns = [
+            "Item", "Descrição", "Valor Unitário de Custo (R$)", "Quantidade", 
+            "Valor Total de Custo (R$)", "Margem de Lucro Bruto (%)", 
+            "Valor Unitário de Venda (R$)", "Valor Total de Venda (R$)", 
+            "Estado de Destino", "ICMS (%)", "Valor unit. ICMS", 
+            "Valor Total ICMS (R$)", "PIS (%)", "Valor unit. PIS", 
+            "Valor Total PIS (R$)", "COFINS (%)", "Valor unit. COFINS", 
+            "Valor Total COFINS (R$)", "IRPJ (%)", "Valor unit. IRPJ", 
+            "Valor Total IRPJ (R$)", "CSLL (%)", "Valor unit. CSLL", 
+            "Valor Total CSLL (R$)", "Valor Total de impostos", 
+            "Valor Total Unitário", "Valor Total", "Total Alíquota Impostos (%)"
+        ]
+        # Modo sob demanda: guarda apenas entradas e alíquotas; as colunas derivadas
+        # são calculadas ao serem lidas (get_rows, totais, gravação)
+        self.lazy_derived = lazy_derived
+        self.stored_columns = [col for col in self.columns if col not in TaxCalculator.DERIVED_FORMULAS] \
+            if lazy_derived else self.columns
+        # Buffer de linhas adicionadas e ainda não consolidadas em self.data
+        self._pending_rows: List[Dict[str, Union[str, float]]] = []
+        self.changes = ChangeSet()
+        # Totais acumulados incrementalmente; audit_totals força o recálculo completo
+        self.audit_totals = False
+        # Diário de alterações para recuperação após falhas (opcional)
+        self.journal: Optional['ChangeJournal'] = None
+        self.history = UndoHistory(self.UNDO_DEPTH)
+        self.tax_config = TaxConfig()
+        # Cálculo em centavos inteiros (None = ponto flutuante)
+        self.fixed_point: Optional[FixedPointConfig] = None
+        # ICMS por origem x destino; sem estado de origem vale apenas a tabela por destino
+        self.origin_state: Optional[str] = None
+        self.icms_rules = ICMSRules()
+        # Alíquotas compiladas (rate_table, icms_matrix) e a configuração que as gerou
+        self._rates: Dict[str, np.ndarray] = {}
+        self._rates_key: Optional[tuple] = None
+        self.data = self.empty_frame()
+        self.current_file = None
+        self.next_item_number = 1
+        
+        self.state_icms_table = {
+            "AC": 17, "AL": 18, "AP": 18, "AM": 20, "BA": 20.5, 
+            "CE": 20, "DF": 20, "ES": 17, "GO": 17, "MA": 22, 
+            "MT": 17, "MS": 17, "MG": 18, "PA": 19, "PB": 18, 
+            "PR": 19.5, "PE": 20.5, "PI": 21, "RJ": 20, "RN": 18, 
+            "RS": 17, "RO": 17.5, "RR": 17, "SC": 17, "SP": 17, 
+            "SE": 18, "TO": 18
+        }
+    
+    @property
+    def data(self) -> pd.DataFrame:
+        """DataFrame com todos os itens, consolidando o buffer de inclusões pendentes"""
+        self.consolidate()
+        return self._data
+    
+    @data.setter
+    def data(self, value: pd.DataFrame) -> None:
+        if self.lazy_derived:
+            value = value[self.stored_columns]
+        # Conversão antes de qualquer alteração: um estado inválido não descarta as linhas pendentes
+        data = self._apply_schema(value)
+        self._pending_rows = []
+        self._data = data
+        self.changes = ChangeSet(reset=True)
+        self._running_totals = self.column_sums(self._data)
+    
+    def row_count(self) -> int:
+        """Quantidade de itens, sem consolidar o buffer de inclusões"""
+        return len(self._data) + len(self._pending_rows)
+    
+    def get_rows(self, start: int, stop: int) -> pd.DataFrame:
+        """Retorna as linhas [start, stop) sem consolidar o buffer de inclusões"""
+        consolidated = len(self._data)
+        if not self._pending_rows or stop <= consolidated:
+            return self.materialize(self._data.iloc[start:stop])
+        
+        first_pending = max(0, start - consolidated)
+        pending_df = self._apply_schema(pd.DataFrame(
+            self._pending_rows[first_pending:stop - consolidated],
+            columns=self.stored_columns,
+            index=range(consolidated + first_pending, min(stop, self.row_count()))
+        ))
+        if start >= consolidated:
+            return self.materialize(pending_df)
+        return self.materialize(pd.concat([self._data.iloc[start:], pending_df]))
+    
+    def materialize(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """Linhas com todas as colunas; no modo sob demanda, calcula as derivadas ausentes"""
+        missing = [col for col in self.columns if col not in rows.columns]
+        if not self.lazy_derived or not missing:
+            return rows
+        tax_calculations = self._taxes_frame(rows)
+        return pd.concat([rows, tax_calculations[missing]], axis=1)[self.columns]
+    
+    def column_sums(self, rows: pd.DataFrame) -> Dict[str, float]:
+        """Soma as colunas de totais de um conjunto de linhas"""
+        if self.lazy_derived and len(rows) > self.MATERIALIZE_CHUNK_SIZE:
+            # Calcula as colunas derivadas por blocos, sem materializar tudo de uma vez
+            parts = [self.column_sums(rows.iloc[start:start + self.MATERIALIZE_CHUNK_SIZE])
+                     for start in range(0, len(rows), self.MATERIALIZE_CHUNK_SIZE)]
+            return {col: sum(part[col] for part in parts) for col in self.TOTAL_COLUMNS}
+        rows = self.materialize(rows)
+        
+        # Garantir que todas as colunas existem no DataFrame
+        valid_columns = [col for col in self.TOTAL_COLUMNS if col in rows.columns]
+        
+        # Com o esquema tipado, a conversão só é necessária para quadros externos
+        numeric = rows[valid_columns]
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in numeric.dtypes):
+            numeric = numeric.apply(lambda x: pd.to_numeric(x, errors='coerce'))
+        if self.fixed_point is not None:
+            # Somas exatas em unidades inteiras (centavos, ou frações no modo por total)
+            return {col: int(np.rint(numeric[col].fillna(0.0).to_numpy(dtype=float)
+                                     * self.fixed_point.column_scale(col)).astype(np.int64).sum())
+                    if col in numeric.columns else 0 for col in self.TOTAL_COLUMNS}
+        sums = numeric.sum().to_dict()
+        return {col: float(sums.get(col, 0.0)) for col in self.TOTAL_COLUMNS}
+    
+    def _total_units(self, column: str, value) -> Union[int, float]:
+        """Valor de uma célula na unidade dos totais acumulados"""
+        number = self._numeric(value)
+        if self.fixed_point is None:
+            return number
+        return int(round(number * self.fixed_point.column_scale(column)))
+    
+    def _row_totals(self, row: Dict[str, Union[str, float]]) -> Dict[str, Union[int, float]]:
+        return {col: self._total_units(col, row.get(col)) for col in self.TOTAL_COLUMNS}
+    
+    def _taxes_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        return TaxCalculator.calculate_taxes_frame(df, self.tax_config, self.fixed_point)
+    
+    def _taxes_row(self, row: Dict[str, Union[str, float]]) -> Dict[str, float]:
+        """Impostos e valores derivados de uma linha, no modo de cálculo atual"""
+        if self.fixed_point is None:
+            return TaxCalculator.calculate_taxes(row, self.tax_config)
+        return self._taxes_frame(pd.DataFrame([row])).iloc[0].to_dict()
+    
+    def _compiled_rates(self) -> Dict[str, np.ndarray]:
+        """Tabelas de alíquotas, recompiladas apenas quando a configuração de impostos,
+        a tabela de ICMS, o estado de origem ou as regras de ICMS mudam"""
+        rules = self.icms_rules
+        key = (astuple(self.tax_config), tuple(self.state_icms_table.get(state) for state in UF_CODES),
+               self.origin_state, rules.difal, rules.imported, tuple(sorted(rules.overrides.items())))
+        if key != self._rates_key:
+            operation, difal = TaxCalculator.compile_icms_matrix(self.state_icms_table, rules, UF_CODES)
+            icms = operation + difal
+            table = TaxCalculator.compile_rate_table(self.state_icms_table, self.tax_config, UF_CODES)
+            if self.origin_state is not None:
+                table[:, ICMS_INDEX] = icms[STATE_CODES[self.origin_state]]
+            self._rates = {'rates': table, 'icms': icms, 'operation': operation, 'difal': difal}
+            self._rates_key = key
+        return self._rates
+    
+    @property
+    def rate_table(self) -> np.ndarray:
+        """Matriz 27 x 5 de alíquotas: linhas na ordem de UF_CODES (códigos da
+        categoria de 'Estado de Destino'), colunas na ordem de TAX_NAMES
+        
+        Com estado de origem, o ICMS de cada destino vem da linha da origem em
+        icms_matrix. Precificar um bloco é uma única indexação por código.
+        """
+        return self._compiled_rates()['rates']
+    
+    @property
+    def icms_matrix(self) -> np.ndarray:
+        """Matriz 27 x 27 de ICMS efetivo (operação + DIFAL), linha = origem, coluna = destino"""
+        return self._compiled_rates()['icms']
+    
+    def icms_route(self, origin: str, destination: str) -> Dict[str, float]:
+        """Composição do ICMS de uma rota: alíquota da operação, DIFAL e total"""
+        if origin not in STATE_CODES or destination not in STATE_CODES:
+            raise ValueError("Estado inválido")
+        rates = self._compiled_rates()
+        route = (STATE_CODES[origin], STATE_CODES[destination])
+        return {'operation': float(rates['operation'][route]), 'difal': float(rates['difal'][route]),
+                'total': float(rates['icms'][route])}
+    
+    def state_rates(self, state: str) -> Dict[str, float]:
+        """Alíquotas aplicadas a um estado de destino, por imposto"""
+        if state not in STATE_CODES or state not in self.state_icms_table:
+            raise ValueError("Estado inválido")
+        return dict(zip(TAX_NAMES, self.rate_table[STATE_CODES[state]].tolist()))
+    
+    @property
+    def editable_columns(self) -> List[str]:
+        """Colunas que podem ser alteradas diretamente
+        
+        Com colunas sob demanda ou cálculo em ponto fixo, as colunas derivadas são
+        sempre recalculadas a partir das entradas e não aceitam edição.
+        """
+        locked = {'Item'}
+        if self.lazy_derived or self.fixed_point is not None:
+            locked.update(TaxCalculator.DERIVED_FORMULAS)
+        return [col for col in self.columns if col not in locked]
+    
+    def schema(self) -> Dict[str, object]:
+        """Tipo de cada coluna de self.data"""
+        return {col: 'int32' if col == 'Item'
+                else STATE_DTYPE if col == 'Estado de Destino'
+                else object if col == 'Descrição'
+                else 'float64'
+                for col in self.columns}
+    
+    def empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in self.schema().items()
+                             if col in self.stored_columns})
+    
+    def _apply_schema(self, df: pd.DataFrame, skip: Iterable[str] = ()) -> pd.DataFrame:
+        """Converte as colunas de df para os tipos de schema(), apenas onde diferem
+        
+        Estados fora das 27 UFs são rejeitados; numeração de itens ausente ou
+        inválida é refeita em sequência. Colunas em skip ficam como estão.
+        """
+        for col, dtype in self.schema().items():
+            if col not in df.columns or col in skip or df[col].dtype == dtype:
+                continue
+            
+            if col == 'Estado de Destino':
+                states = df[col].astype(object).where(df[col].notna(), None)
+                states = states.map(lambda state: state.strip().upper() if isinstance(state, str) else state)
+                states = states.where(states != '', None)
+                invalid = states.notna() & ~states.isin(UF_CODES)
+                if invalid.any():
+                    raise ValueError(f"Estado inválido: {states[invalid].iloc[0]}")
+                df[col] = states.astype(STATE_DTYPE)
+            elif col == 'Item':
+                numbers = pd.to_numeric(df[col], errors='coerce')
+                if numbers.isna().any():
+                    numbers = pd.Series(np.arange(1, len(df) + 1), index=df.index)
+                df[col] = numbers.astype('int32')
+            elif dtype == 'float64':
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+            else:
+                df[col] = df[col].astype(dtype)
+        return df
+    
+    @staticmethod
+    def _numeric(value) -> float:
+        number = pd.to_numeric(value, errors='coerce')
+        return 0.0 if pd.isna(number) else float(number)
+    
+    def _add_to_totals(self, sums: Dict[str, float], sign: int = 1) -> None:
+        for col in self.TOTAL_COLUMNS:
+            value = sums.get(col, 0.0)
+            if not pd.isna(value):
+                self._running_totals[col] += sign * value
+    
+    def _record(self, operation: str, **arguments) -> None:
+        if self.journal is not None:
+            self.journal.append(operation, **arguments)
+    
+    def consume_changes(self) -> ChangeSet:
+        """Entrega as alterações acumuladas e inicia um novo registro"""
+        changes, self.changes = self.changes, ChangeSet()
+        return changes
+    
+    def consolidate(self) -> None:
+        """Incorpora ao DataFrame as inclusões pendentes, se houver
+        
+        Chamado antes de entregar o modelo a outra thread (gravação, exportação),
+        para que ela apenas leia os dados.
+        """
+        if self._pending_rows:
+            self._consolidate()
+    
+    def _consolidate(self) -> None:
+        """Incorpora as linhas pendentes ao DataFrame com uma única concatenação"""
+        pending_df = self._apply_schema(pd.DataFrame(self._pending_rows, columns=self.stored_columns))
+        self._pending_rows = []
+        self._append_frame(pending_df)
+    
+    def _append_frame(self, new_df: pd.DataFrame) -> None:
+        if self._data.empty:
+            self._data = new_df.reset_index(drop=True)
+        else:
+            self._data = pd.concat([self._data, new_df], ignore_index=True)
+    
+    def _parse_item(self, item_data: Dict[str, Union[str, float]]) -> Dict[str, Union[str, float]]:
+        """Converte e valida os campos de entrada de um item"""
+        processed_data = {}
+        for key, value in item_data.items():
+            if key in ['Descrição', 'Estado de Destino']:
+                processed_data[key] = str(value)
+            else:
+                if isinstance(value, str):
+                    processed_data[key] = float(value.replace('.', '').replace(',', '.'))
+                else:
+                    processed_data[key] = float(value)
+        
+        if processed_data['Estado de Destino'] not in self.state_icms_table:
+            raise ValueError("Estado inválido")
+        if processed_data['Valor Unitário de Custo (R$)'] <= 0:
+            raise ValueError("Valor unitário de custo deve ser positivo")
+        if processed_data['Quantidade'] <= 0:
+            raise ValueError("Quantidade deve ser positiva")
+        if not processed_data['Descrição']:
+            raise ValueError("Descrição do item é obrigatória")
+        
+        # Alíquotas não informadas usam as do estado de destino
+        for tax_name, rate in self.state_rates(processed_data['Estado de Destino']).items():
+            processed_data.setdefault(f'{tax_name} (%)', rate)
+        
+        return processed_data
+    
+    def add_item(self, item_data: Dict[str, Union[str, float]]) -> None:
+        """Adiciona um novo item ao DataFrame com validação completa
+        
+        A linha vai para um buffer e só é concatenada ao DataFrame quando os
+        dados forem lidos, mantendo a inclusão em tempo constante.
+        """
+        try:
+            processed_data = self._parse_item(item_data)
+            tax_calculations = self._taxes_row(processed_data)
+            new_row = {**processed_data, **tax_calculations}
+            new_row['Item'] = self.next_item_number
+            
+            self.history.push(RowsInserted(self.row_count(), self.next_item_number,
+                                           self.next_item_number + 1))
+            self.changes.inserted.add(self.row_count())
+            self._pending_rows.append(new_row)
+            self._add_to_totals(self._row_totals(new_row))
+            self.next_item_number += 1
+            
+        except Exception as e:
+            raise ValueError(f"Erro ao adicionar item: {str(e)}")
+        self._record('add_item', item_data=item_data)
+    
+    def add_items(self, items: Iterable[Dict[str, Union[str, float]]]) -> int:
+        """Adiciona vários itens de uma vez, com cálculo vetorizado e uma única concatenação
+        
+        A operação é atômica: se algum item for inválido, nenhum é adicionado.
+        Retorna a quantidade de itens incluídos.
+        """
+        items = list(items)
+        processed_rows = []
+        for position, item_data in enumerate(items, start=1):
+            try:
+                processed_rows.append(self._parse_item(item_data))
+            except Exception as e:
+                raise ValueError(f"Erro ao adicionar item {position}: {str(e)}")
+        
+        if not processed_rows:
+            return 0
+        
+        new_df = pd.DataFrame(processed_rows)
+        tax_calculations = self._taxes_frame(new_df)
+        new_df[list(tax_calculations.columns)] = tax_calculations
+        new_df['Item'] = range(self.next_item_number, self.next_item_number + len(new_df))
+        
+        # Garante que inclusões avulsas anteriores mantenham a ordem
+        if self._pending_rows:
+            self._consolidate()
+        first_index = len(self._data)
+        self._append_frame(self._apply_schema(new_df.reindex(columns=self.stored_columns)))
+        self.changes.inserted.update(range(first_index, len(self._data)))
+        self._add_to_totals(self.column_sums(new_df))
+        self.history.push(RowsInserted(first_index, self.next_item_number,
+                                       self.next_item_number + len(new_df)))
+        self.next_item_number += len(new_df)
+        self._record('add_items', items=items)
+        return len(new_df)
+    
+    def price_frame(self, items: pd.DataFrame, first_item: int = 1) -> pd.DataFrame:
+        """Valida e precifica um bloco de itens de entrada de forma vetorizada, sem alterar o modelo
+        
+        items traz as colunas de INPUT_COLUMNS e, opcionalmente, as alíquotas; as
+        ausentes vêm da tabela de ICMS (pelo estado) e da configuração de impostos.
+        As linhas retornadas são numeradas a partir de first_item.
+        """
+        missing = [col for col in self.INPUT_COLUMNS if col not in items.columns]
+        if missing:
+            raise ValueError(f"Colunas ausentes: {', '.join(missing)}")
+        
+        df = pd.DataFrame(index=items.index)
+        df['Descrição'] = items['Descrição'].fillna('').astype(str)
+        states = pd.Categorical(items['Estado de Destino'], dtype=STATE_DTYPE)
+        df['Estado de Destino'] = states
+        for col in ['Valor Unitário de Custo (R$)', 'Quantidade', 'Margem de Lucro Bruto (%)']:
+            df[col] = pd.to_numeric(items[col], errors='coerce')
+        
+        # Alíquotas não informadas: uma indexação da tabela compilada pelo código do estado
+        codes = states.codes
+        rates = self.rate_table[codes]
+        rates[codes < 0] = np.nan
+        if self.ORIGIN_COLUMN in items.columns:
+            # Origem por item: ICMS da matriz origem x destino
+            origins = items[self.ORIGIN_COLUMN]
+            # Valores fora das UFs viram ausentes (código -1) antes da conversão para categorias
+            origins = pd.Categorical(origins.where(origins.isin(UF_CODES)), dtype=STATE_DTYPE).codes
+            if (origins < 0).any():
+                invalid = pd.Series(origins < 0, index=items.index)
+                raise ValueError(f"Erro no item {invalid.idxmax() + 1}: Estado de origem inválido")
+            rates[:, ICMS_INDEX] = TaxCalculator.icms_rates(self.icms_matrix, origins, codes)
+        for position, tax_name in enumerate(TAX_NAMES):
+            col = f'{tax_name} (%)'
+            given = pd.to_numeric(items[col], errors='coerce').to_numpy(dtype=float) if col in items.columns \
+                else np.full(len(items), np.nan)
+            df[col] = np.where(np.isnan(given), rates[:, position], given)
+        
+        # Mesmas regras de _parse_item, avaliadas para o bloco inteiro
+        checks = [
+            (pd.Series(np.isnan(rates[:, ICMS_INDEX]), index=items.index), "Estado inválido"),
+            (df[self.INPUT_COLUMNS[1:4]].isna().any(axis=1), "Valor numérico inválido"),
+            (~(df['Valor Unitário de Custo (R$)'] > 0), "Valor unitário de custo deve ser positivo"),
+            (~(df['Quantidade'] > 0), "Quantidade deve ser positiva"),
+            (df['Descrição'] == '', "Descrição do item é obrigatória")
+        ]
+        for invalid, message in checks:
+            if invalid.any():
+                raise ValueError(f"Erro no item {invalid.idxmax() + 1}: {message}")
+        
+        tax_calculations = self._taxes_frame(df)
+        df[list(tax_calculations.columns)] = tax_calculations
+        df['Item'] = range(first_item, first_item + len(df))
+        return self._apply_schema(df.reindex(columns=self.columns))
+    
+    def update_item(self, index: int, column: str, new_value: Union[str, float]) -> None:
+        """Atualiza um valor específico e recalcula apenas as colunas dependentes"""
+        try:
+            if column not in ['Descrição', 'Estado de Destino', 'Item']:
+                if isinstance(new_value, str):
+                    new_value = float(new_value.replace('.', '').replace(',', '.'))
+                new_value = float(new_value)
+            if column == 'Estado de Destino' and new_value not in self.state_icms_table:
+                raise ValueError("Estado inválido")
+            if column in TaxCalculator.DERIVED_FORMULAS and column not in self.editable_columns:
+                raise ValueError(f"Coluna calculada: {column}")
+            
+            data = self.data
+            previous_row = data.loc[index].to_dict()
+            if self.lazy_derived:
+                # Valores derivados não ficam guardados; são necessários para ajustar os totais
+                previous_row.update(self._taxes_row(previous_row))
+            updates = {column: new_value}
+            downstream = TaxCalculator.downstream_columns(column)
+            if self.fixed_point is None:
+                updates.update(TaxCalculator.recalculate({**previous_row, **updates}, downstream))
+            else:
+                priced = self._taxes_row({**previous_row, **updates})
+                updates.update({col: priced[col] for col in downstream})
+            stored = {col: value for col, value in updates.items() if col in data.columns}
+            
+            # Escrita célula a célula: no pandas, data.loc[index, colunas] é bem mais lento
+            for col, value in stored.items():
+                data.at[index, col] = value
+            
+            for col in self.TOTAL_COLUMNS:
+                if col in updates:
+                    self._running_totals[col] += (self._total_units(col, updates[col])
+                                                  - self._total_units(col, previous_row.get(col)))
+            self.changes.updated.add(index)
+            self.history.push(CellsEdit(
+                before=pd.DataFrame([{col: previous_row[col] for col in stored}], index=[index]),
+                after=pd.DataFrame([stored], index=[index])
+            ))
+                    
+        except Exception as e:
+            raise ValueError(f"Erro ao atualizar item: {str(e)}")
+        self._record('update_item', index=index, column=column, new_value=new_value)
+    
+    def update_column(self, column: str, new_value: Union[str, float],
+                      indices: Optional[Iterable[int]] = None,
+                      where: Optional[Dict[str, Union[str, float]]] = None) -> List[int]:
+        """Define o mesmo valor de uma coluna para várias linhas e recalcula os dependentes
+        
+        As linhas são as de indices e/ou as que satisfazem todas as igualdades de where
+        (por exemplo {'Estado de Destino': 'SP'}); sem nenhum dos dois, todas as linhas.
+        O recálculo é vetorizado. Retorna os índices alterados.
+        """
+        try:
+            if column not in self.columns or column == 'Item':
+                raise ValueError(f"Coluna inválida: {column}")
+            if column not in self.editable_columns:
+                raise ValueError(f"Coluna calculada: {column}")
+            if column not in ['Descrição', 'Estado de Destino']:
+                if isinstance(new_value, str):
+                    new_value = float(new_value.replace('.', '').replace(',', '.'))
+            if column == 'Estado de Destino' and new_value not in self.state_icms_table:
+                raise ValueError("Estado inválido")
+            
+            data = self.data
+            mask = pd.Series(indices is None, index=data.index)
+            if indices is not None:
+                mask[list(indices)] = True
+            for filter_column, filter_value in (where or {}).items():
+                mask &= data[filter_column] == filter_value
+            rows = data.index[mask]
+            if rows.empty:
+                return []
+            
+            self._assign_and_recalculate(rows, column, new_value)
+            
+        except Exception as e:
+            raise ValueError(f"Erro ao atualizar itens: {str(e)}")
+        self._record('update_column', column=column, new_value=new_value, indices=list(rows))
+        return list(rows)
+    
+    def _assign_and_recalculate(self, rows: pd.Index, column: str, values) -> None:
+        """Grava values em column nas linhas informadas e recalcula os dependentes de uma vez"""
+        data = self.data
+        # No modo sob demanda nenhuma coluna derivada é gravada
+        dependents = [col for col in TaxCalculator.downstream_columns(column) if col in data.columns]
+        affected = [column, *dependents]
+        
+        # As linhas são copiadas uma única vez, recalculadas na cópia e gravadas de volta
+        updated = data.loc[rows]
+        before = updated[affected].copy()
+        previous_sums = self.column_sums(updated)
+        
+        updated[column] = values
+        if dependents:
+            tax_calculations = self._taxes_frame(updated)
+            updated[dependents] = tax_calculations[dependents]
+        after = updated[affected]
+        data.loc[rows, affected] = after
+        
+        self._add_to_totals(previous_sums, sign=-1)
+        self._add_to_totals(self.column_sums(updated))
+        self.changes.updated.update(rows)
+        self.history.push(CellsEdit(before=before, after=after))
+    
+    def reprice_icms(self, states: Optional[Iterable[str]] = None) -> int:
+        """Reaplica a tabela de ICMS por estado aos itens existentes
+        
+        Considera apenas os estados informados (todos, se None) e altera somente as
+        linhas cuja alíquota difere da tabela. Retorna a quantidade de itens alterados.
+        """
+        try:
+            data = self.data
+            if data.empty:
+                return 0
+            
+            selected = list(self.state_icms_table) if states is None else [
+                state for state in states if state in self.state_icms_table
+            ]
+            codes = data['Estado de Destino'].cat.codes.to_numpy()
+            new_rates = self.rate_table[codes, ICMS_INDEX]
+            new_rates[~np.isin(codes, [STATE_CODES[state] for state in selected])] = np.nan
+            mask = ~np.isnan(new_rates) & (new_rates != data['ICMS (%)'].to_numpy())
+            rows = data.index[mask]
+            
+            if not rows.empty:
+                self._assign_and_recalculate(rows, 'ICMS (%)', new_rates[mask])
+            
+        except Exception as e:
+            raise ValueError(f"Erro ao reaplicar tabela de ICMS: {str(e)}")
+        self._record('reprice_icms', states=None if states is None else selected)
+        return len(rows)
+    
+    def set_icms_table(self, table: Dict[str, float]) -> None:
+        """Substitui a tabela de ICMS por estado"""
+        self.history.push(ICMSTableChanged(before=self.state_icms_table, after=dict(table)))
+        self.state_icms_table = dict(table)
+        self._record('set_icms_table', table=self.state_icms_table)
+    
+    def set_icms_rules(self, origin_state: Optional[str],
+                       rules: Optional[Union[ICMSRules, Dict[str, object]]] = None) -> None:
+        """Define o estado de origem (None = apenas a tabela por destino) e as regras de ICMS"""
+        if origin_state is not None and origin_state not in STATE_CODES:
+            raise ValueError(f"Estado de origem inválido: {origin_state}")
+        if rules is None:
+            rules = self.icms_rules
+        elif isinstance(rules, dict):
+            rules = ICMSRules(**rules)
+        self.history.push(ICMSRulesChanged(before=(self.origin_state, self.icms_rules), after=(origin_state, rules)))
+        self.origin_state, self.icms_rules = origin_state, rules
+        self._record('set_icms_rules', origin_state=origin_state, rules=asdict(rules))
+    
+    def delete_items(self, indices: List[int]) -> None:
+        """Remove itens do DataFrame pelos índices"""
+        positions = np.unique(np.asarray(indices, dtype=np.int64))
+        self.history.push(RowsDeleted(positions, self.data.loc[positions], self.next_item_number))
+        self._delete_rows(positions)
+        self._record('delete_items', indices=list(indices))
+    
+    def _delete_rows(self, positions: np.ndarray) -> None:
+        self._add_to_totals(self.column_sums(self.data.loc[positions]), sign=-1)
+        self._data = self.data.drop(positions).reset_index(drop=True)
+        self._data['Item'] = np.arange(1, len(self._data) + 1, dtype=np.int32)
+        self.next_item_number = len(self._data) + 1
+        self.changes.deleted.update(positions.tolist())
+        if self._data.empty:
+            self._running_totals = self.column_sums(self._data)
+    
+    def calculate_totals(self, verify: bool = False) -> Dict[str, float]:
+        """Retorna os totais consolidados, mantidos incrementalmente a cada alteração
+        
+        Com verify=True (ou audit_totals ativo) os totais são recalculados sobre todo
+        o DataFrame e substituem os acumulados, descartando desvios de arredondamento.
+        """
+        if self.row_count() == 0:
+            return {}
+        
+        if verify or self.audit_totals:
+            self._running_totals = self.column_sums(self.data)
+        
+        totals = self.totals_values(self._running_totals)
+        
+        # Adicionar campos não numéricos
+        totals['Descrição'] = "TOTAL"
+        totals['Item'] = ""
+        totals['Estado de Destino'] = ""
+        totals['Margem de Lucro Bruto (%)'] = ""
+        
+        # Garantir todas as colunas necessárias
+        for col in self.columns:
+            if col not in totals:
+                totals[col] = ""
+        
+        return totals
+
+    def totals_values(self, sums: Dict[str, Union[int, float]]) -> Dict[str, float]:
+        """Converte somas de column_sums em totais; em ponto fixo, arredonda conforme o modo"""
+        if self.fixed_point is None:
+            return dict(sums)
+        return {col: self.fixed_point.total(value, col) for col, value in sums.items()}
+    
+    def _reprice_derived(self) -> None:
+        """Recalcula as colunas derivadas guardadas de todos os itens e os totais"""
+        data = self.data
+        derived = [col for col in TaxCalculator.DERIVED_FORMULAS if col in data.columns]
+        if derived and not data.empty:
+            data[derived] = self._taxes_frame(data)[derived]
+        self._running_totals = self.column_sums(data)
+        self.changes = ChangeSet(reset=True)
+    
+    def set_fixed_point(self, fixed_point: Optional[Union[FixedPointConfig, Dict[str, object]]]) -> None:
+        """Liga (ou desliga, com None) o cálculo em ponto fixo e reprecifica todos os itens"""
+        if isinstance(fixed_point, dict):
+            fixed_point = FixedPointConfig(**fixed_point)
+        previous, self.fixed_point = self.fixed_point, fixed_point
+        try:
+            self._reprice_derived()
+        except ValueError:
+            self.fixed_point = previous
+            raise
+        # Edições anteriores guardam valores calculados no modo antigo
+        self.history.clear()
+        self._record('set_fixed_point', fixed_point=None if fixed_point is None else asdict(fixed_point))
+    
+    def clear_data(self) -> None:
+        self.history.push(DataCleared(self.data, self.next_item_number))
+        self.data = self.empty_frame()
+        self.next_item_number = 1
+        self._record('clear_data')
+    
+    # ---------- Desfazer / refazer ----------
+    
+    def begin_group(self) -> None:
+        """Inicia um grupo de operações que será desfeito de uma só vez"""
+        self.history.begin_group()
+        self._record('begin_group')
+    
+    def end_group(self) -> None:
+        self.history.end_group()
+        self._record('end_group')
+    
+    def undo(self) -> bool:
+        """Desfaz a última operação; retorna False se não houver o que desfazer"""
+        if not self.history.can_undo():
+            return False
+        entry = self.history.undo_stack.pop()
+        self._revert(entry)
+        self.history.redo_stack.append(entry)
+        self._record('undo')
+        return True
+    
+    def redo(self) -> bool:
+        """Refaz a última operação desfeita; retorna False se não houver o que refazer"""
+        if not self.history.can_redo():
+            return False
+        entry = self.history.redo_stack.pop()
+        self._reapply(entry)
+        self.history.undo_stack.append(entry)
+        self._record('redo')
+        return True
+    
+    def _revert(self, entry: object) -> None:
+        if isinstance(entry, CompoundEdit):
+            for sub_entry in reversed(entry.entries):
+                self._revert(sub_entry)
+        elif isinstance(entry, CellsEdit):
+            self._write_cells(entry.before)
+        elif isinstance(entry, RowsInserted):
+            entry.rows = self._truncate_rows(entry.start)
+            self.next_item_number = entry.next_item_before
+        elif isinstance(entry, RowsDeleted):
+            self._restore_rows(entry.positions, entry.rows)
+            self.next_item_number = entry.next_item_before
+        elif isinstance(entry, DataCleared):
+            self.data = entry.previous
+            self.next_item_number = entry.next_item_before
+        elif isinstance(entry, ICMSTableChanged):
+            self.state_icms_table = dict(entry.before)
+        elif isinstance(entry, ICMSRulesChanged):
+            self.origin_state, self.icms_rules = entry.before
+    
+    def _reapply(self, entry: object) -> None:
+        if isinstance(entry, CompoundEdit):
+            for sub_entry in entry.entries:
+                self._reapply(sub_entry)
+        elif isinstance(entry, CellsEdit):
+            self._write_cells(entry.after)
+        elif isinstance(entry, RowsInserted):
+            first_index = len(self.data)
+            self._append_frame(entry.rows)
+            self.changes.inserted.update(range(first_index, len(self._data)))
+            self._add_to_totals(self.column_sums(entry.rows))
+            self.next_item_number = entry.next_item_after
+            entry.rows = None
+        elif isinstance(entry, RowsDeleted):
+            self._delete_rows(entry.positions)
+        elif isinstance(entry, DataCleared):
+            self.data = self.empty_frame()
+            self.next_item_number = 1
+        elif isinstance(entry, ICMSTableChanged):
+            self.state_icms_table = dict(entry.after)
+        elif isinstance(entry, ICMSRulesChanged):
+            self.origin_state, self.icms_rules = entry.after
+    
+    def _write_cells(self, values: pd.DataFrame) -> None:
+        """Grava um bloco de células (índice = linhas, colunas = colunas) ajustando os totais"""
+        data = self.data
+        rows = values.index
+        previous_sums = self.column_sums(data.loc[rows])
+        if len(rows) == 1:
+            # Caso comum (edição de uma célula): .at é bem mais rápido que .loc
+            for col, value in values.iloc[0].items():
+                data.at[rows[0], col] = value
+        else:
+            data.loc[rows, values.columns] = values
+        self._add_to_totals(previous_sums, sign=-1)
+        self._add_to_totals(self.column_sums(data.loc[rows]))
+        self.changes.updated.update(rows)
+    
+    def _truncate_rows(self, start: int) -> pd.DataFrame:
+        """Remove as linhas a partir de start e as retorna"""
+        consolidated = len(self._data)
+        if start >= consolidated:
+            # Linhas ainda no buffer de inclusões: basta retirá-las da lista
+            removed = self._apply_schema(pd.DataFrame(self._pending_rows[start - consolidated:],
+                                                      columns=self.stored_columns,
+                                                      index=range(start, self.row_count())))
+            del self._pending_rows[start - consolidated:]
+        else:
+            data = self.data
+            removed = data.iloc[start:].copy()
+            self._data = data.iloc[:start].copy()
+        
+        self._add_to_totals(self.column_sums(removed), sign=-1)
+        self.changes.deleted.update(removed.index)
+        return removed
+    
+    def _restore_rows(self, positions: np.ndarray, rows: pd.DataFrame) -> None:
+        """Reinsere linhas removidas nas posições originais com uma única concatenação"""
+        remaining = self.data
+        total = len(remaining) + len(rows)
+        restored = np.zeros(total, dtype=bool)
+        restored[positions] = True
+        order = np.empty(total, dtype=np.int64)
+        order[~restored] = np.arange(len(remaining))
+        order[restored] = np.arange(len(remaining), total)
+        
+        combined = pd.concat([remaining, rows], ignore_index=True) if not remaining.empty else rows
+        self._data = combined.iloc[order].reset_index(drop=True)
+        self._data['Item'] = np.arange(1, total + 1, dtype=np.int32)
+        self._add_to_totals(self.column_sums(rows))
+        self.changes.inserted.update(positions.tolist())
+    
+    def column_dtypes(self) -> Dict[str, str]:
+        """Tipos de dados esperados para cada coluna na leitura de arquivos"""
+        # 'Item' é lido como float pois a linha de totais o deixa vazio
+        return {col: 'str' if col in ['Descrição', 'Estado de Destino'] else 'float64'
+                for col in self.columns}
+    
+    def _fill_missing_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Garante todas as colunas necessárias"""
+        for col in self.columns:
+            if col not in df.columns:
+                df[col] = 0.0 if col not in ['Descrição', 'Estado de Destino', 'Item'] else ""
+        return df
+    
+    def _read_csv_chunks(self, filepath: str, progress: Optional[Callable[[float], None]] = None) -> pd.DataFrame:
+        """Lê um CSV em blocos de CSV_CHUNK_SIZE linhas com tipos explícitos
+        
+        Cada bloco é completado e convertido para os tipos de schema() antes do
+        próximo ser lido, de modo que apenas um bloco por vez fica com estados em
+        texto. A coluna Item é convertida só ao final, pois a numeração ausente é
+        refeita sobre o arquivo inteiro.
+        """
+        file_size = os.path.getsize(filepath) or 1
+        chunks = []
+        pending = None
+        with open(filepath, 'rb') as handle:
+            reader = pd.read_csv(handle, chunksize=self.CSV_CHUNK_SIZE, dtype=self.column_dtypes())
+            for chunk in reader:
+                # Um bloco de atraso: a linha de totais só é reconhecida no último
+                if pending is not None:
+                    chunks.append(self._apply_schema(pending, skip=('Item',)))
+                pending = self._fill_missing_columns(chunk)
+                if progress:
+                    progress(min(1.0, handle.tell() / file_size))
+        
+        if pending is None:
+            return self._fill_missing_columns(pd.DataFrame())
+        
+        # Remove linha de totais se existir (sempre a última do último bloco)
+        if not pending.empty and pending.iloc[-1]['Descrição'] == "TOTAL":
+            pending = pending.iloc[:-1].copy()
+        chunks.append(self._apply_schema(pending, skip=('Item',)))
+        
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0].reset_index(drop=True)
+        return self._apply_schema(df)
+    
+    def read_file(self, filepath: str, progress: Optional[Callable[[float], None]] = None) -> pd.DataFrame:
+        """Lê um arquivo removendo os totais existentes, sem alterar o modelo
+        
+        Arquivos CSV são lidos em blocos; progress, se informado, recebe a fração
+        do arquivo já processada (0.0 a 1.0) e pode interromper a leitura
+        levantando OperationCancelled.
+        """
+        try:
+            if filepath.endswith(self.PROJECT_EXTENSION):
+                df = self._read_project(filepath)
+            elif filepath.endswith('.xlsx'):
+                df = pd.read_excel(filepath)
+                
+                # Remove linha de totais se existir
+                if not df.empty and df.iloc[-1]['Descrição'] == "TOTAL":
+                    df = df.iloc[:-1].copy()  # Remove última linha
+                
+                df = self._fill_missing_columns(df)
+            elif filepath.endswith('.csv'):
+                df = self._read_csv_chunks(filepath, progress)
+            else:
+                raise ValueError("Formato de arquivo não suportado")
+            
+            # Conversão e validação (estados) nesta thread, antes de tocar no modelo
+            df = self._apply_schema(df)
+            if progress:
+                progress(1.0)
+            return df
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erro ao carregar arquivo: {str(e)}")   
+    
+    def replace_data(self, df: pd.DataFrame, filepath: Optional[str] = None) -> None:
+        """Substitui todos os itens pelos de um DataFrame lido de arquivo
+        
+        Arquivos de projeto também restauram configuração de impostos, tabela de
+        ICMS e numeração de itens, guardadas em df.attrs.
+        """
+        metadata = df.attrs.pop('projeto', None)
+        # Tipos validados antes de aplicar os metadados (já convertidos por read_file)
+        df = self._apply_schema(df)
+        if metadata and 'fixed_point' in metadata:
+            # Antes dos dados, para que os totais usem o mesmo modo de cálculo
+            self.fixed_point = FixedPointConfig(**metadata['fixed_point']) if metadata['fixed_point'] else None
+        self.data = df
+        if self.fixed_point is not None:
+            # Valores lidos de arquivo passam a seguir o cálculo em ponto fixo
+            self._reprice_derived()
+        self.history.clear()
+        if not self.data.empty:
+            self.next_item_number = int(self.data['Item'].max()) + 1
+        else:
+            self.next_item_number = 1
+        
+        if metadata:
+            self.tax_config = TaxConfig(**metadata['tax_config'])
+            self.state_icms_table = metadata['state_icms_table']
+            self.next_item_number = max(self.next_item_number, metadata['next_item_number'])
+            if 'icms_rules' in metadata:
+                self.origin_state = metadata['origin_state']
+                self.icms_rules = ICMSRules(**metadata['icms_rules'])
+        
+        self.current_file = filepath
+        
+        # Dados substituídos por inteiro: o diário recomeça a partir de um novo instantâneo
+        if self.journal is not None:
+            self.journal.snapshot(self, replaced=True)
+    
+    def project_metadata(self) -> Dict[str, object]:
+        """Estado do modelo, além dos itens, guardado em projetos e instantâneos"""
+        return {
+            'tax_config': asdict(self.tax_config),
+            'state_icms_table': self.state_icms_table,
+            'next_item_number': int(self.next_item_number),
+            'fixed_point': asdict(self.fixed_point) if self.fixed_point is not None else None,
+            'origin_state': self.origin_state,
+            'icms_rules': asdict(self.icms_rules)
+        }
+    
+    @staticmethod
+    def project_format_available() -> bool:
+        return pa is not None
+    
+    def _read_project(self, filepath: str) -> pd.DataFrame:
+        """Lê um arquivo de projeto mapeando-o em memória"""
+        if pa is None:
+            raise ValueError("O formato de projeto requer o pacote pyarrow")
+        
+        with pa.memory_map(filepath, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas()
+        
+        raw_metadata = (table.schema.metadata or {}).get(self.PROJECT_METADATA_KEY)
+        df = self._fill_missing_columns(df)
+        df.attrs['projeto'] = json.loads(raw_metadata) if raw_metadata else None
+        return df
+    
+    def _write_project(self, filepath: str) -> None:
+        """Grava os itens (sem a linha de totais) e o estado do modelo em Arrow IPC"""
+        if pa is None:
+            raise ValueError("O formato de projeto requer o pacote pyarrow")
+        
+        metadata = self.project_metadata()
+        if self.lazy_derived:
+            # O projeto guarda todas as colunas; as derivadas são calculadas bloco a bloco
+            data = self.data
+            size = self.MATERIALIZE_CHUNK_SIZE
+            table = pa.concat_tables([
+                pa.Table.from_pandas(self.materialize(data.iloc[start:start + size]), preserve_index=False)
+                for start in range(0, max(len(data), 1), size)
+            ])
+        else:
+            table = pa.Table.from_pandas(self.data, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            self.PROJECT_METADATA_KEY: json.dumps(metadata).encode('utf-8')
+        })
+        # Sem compressão, para permitir leitura direta do arquivo mapeado em memória
+        feather.write_feather(table, filepath, compression='uncompressed')
+    
+    def load_from_file(self, filepath: str, progress: Optional[Callable[[float], None]] = None) -> None:
+        """Carrega dados removendo totais existentes do arquivo"""
+        self.replace_data(self.read_file(filepath, progress), filepath)
+    
+    def _write_csv_chunks(self, handle, totals: Dict[str, float],
+                          progress: Optional[Callable[[float], None]] = None) -> None:
+        data = self.data
+        total_rows = max(len(data), 1)
+        for start in range(0, total_rows, self.CSV_CHUNK_SIZE):
+            chunk = self.materialize(data.iloc[start:start + self.CSV_CHUNK_SIZE])
+            chunk.to_csv(handle, index=False, header=start == 0)
+            if progress:
+                progress(min(1.0, (start + self.CSV_CHUNK_SIZE) / total_rows))
+        
+        if totals:
+            pd.DataFrame([totals]).reindex(columns=self.columns).to_csv(handle, index=False, header=False)
+    
+    def _write_xlsx_chunks(self, writer: XlsxStreamWriter, totals: Dict[str, float],
+                           progress: Optional[Callable[[float], None]] = None) -> None:
+        data = self.data
+        total_rows = max(len(data), 1)
+        for start in range(0, len(data), self.XLSX_CHUNK_SIZE):
+            writer.write_frame(self.materialize(data.iloc[start:start + self.XLSX_CHUNK_SIZE]))
+            if progress:
+                progress(min(1.0, (start + self.XLSX_CHUNK_SIZE) / total_rows))
+        
+        # Linha de totais gravada à parte, sem copiar nem concatenar o DataFrame
+        if totals:
+            writer.write_frame(pd.DataFrame([totals]))
+    
+    def export_to_file(self, filepath: str, progress: Optional[Callable[[float], None]] = None) -> None:
+        """Grava os dados no formato indicado pela extensão, sem mudar o arquivo atual
+        
+        Planilhas (.xlsx, .csv) recebem os totais como última linha; o formato de
+        projeto guarda apenas os itens. A gravação é feita em um arquivo temporário
+        que só substitui o destino ao final, de modo que erros ou cancelamento (via
+        progress) não o corrompem.
+        """
+        try:
+            if not filepath.endswith(('.xlsx', '.csv', self.PROJECT_EXTENSION)):
+                raise ValueError("Formato de arquivo não suportado")
+            
+            root, extension = os.path.splitext(filepath)
+            temp_path = f"{root}.tmp{extension}"
+            
+            try:
+                if filepath.endswith(self.PROJECT_EXTENSION):
+                    if progress:
+                        progress(0.0)
+                    self._write_project(temp_path)
+                elif filepath.endswith('.xlsx'):
+                    totals = self.calculate_totals(verify=True)
+                    with XlsxStreamWriter(temp_path, self.columns) as writer:
+                        self._write_xlsx_chunks(writer, totals, progress)
+                else:
+                    totals = self.calculate_totals(verify=True)
+                    with open(temp_path, 'w', newline='', encoding='utf-8') as handle:
+                        self._write_csv_chunks(handle, totals, progress)
+                
+                os.replace(temp_path, filepath)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            
+            if progress:
+                progress(1.0)
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erro ao salvar arquivo: {str(e)}")
+    
+    def save_to_file(self, filepath: str, progress: Optional[Callable[[float], None]] = None) -> None:
+        """Salva os dados e passa a usar filepath como arquivo atual"""
+        self.export_to_file(filepath, progress)
+        self.current_file = filepath
+
+class ChangeJournal:
+    """Diário de alterações com gravação incremental e recuperação após falhas
+    
+    Cada operação do modelo vira uma linha JSON acrescentada ao diário, e o fsync
+    é feito no máximo a cada FSYNC_INTERVAL segundos. Periodicamente o estado
+    completo é gravado como instantâneo e o diário recomeça vazio. Na recuperação,
+    o instantâneo é carregado e as operações posteriores a ele são reaplicadas.
+    
+    O instantâneo é gravado em uma thread separada, a partir de uma cópia do estado:
+    até a gravação terminar, o diário anterior fica em previous_path e continua
+    valendo para a recuperação.
+    """
+    FSYNC_INTERVAL = 1.0
+    COMPACT_EVERY = 5000
+    
+    # Operações do DataModel que podem ser reaplicadas a partir do diário
+    REPLAYABLE = {'add_item', 'add_items', 'update_item', 'update_column', 'delete_items',
+                  'reprice_icms', 'set_icms_table', 'clear_data', 'begin_group', 'end_group',
+                  'undo', 'redo', 'set_fixed_point', 'set_icms_rules'}
+    
+    SESSION_PREFIX = 'sessao_'
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, 'diario.jsonl')
+        self.previous_path = os.path.join(directory, 'diario.anterior.jsonl')
+        self.snapshot_path = os.path.join(directory, 'instantaneo.pkl')
+        self.lock_path = os.path.join(directory, 'sessao.lock')
+        self.lock_handle = None
+        self.handle = None
+        self.writer: Optional[threading.Thread] = None
+        self.snapshot_error: Optional[Exception] = None
+        self.sequence = 0
+        self.records_since_snapshot = 0
+        self.last_sync = time.monotonic()
+        self.dirty = False
+    
+    @classmethod
+    def new_session(cls, base_directory: str) -> 'ChangeJournal':
+        """Diário em um diretório próprio desta sessão, travado enquanto ela durar
+        
+        Cada janela do programa usa o seu, de modo que uma não recupera nem
+        apaga as alterações de outra em execução.
+        """
+        directory = os.path.join(base_directory, f"{cls.SESSION_PREFIX}{os.getpid()}_{uuid.uuid4().hex[:8]}")
+        journal = cls(directory)
+        if not journal.acquire():
+            raise OSError(f"Não foi possível travar o diário em {directory}")
+        return journal
+    
+    @classmethod
+    def orphaned_sessions(cls, base_directory: str) -> List['ChangeJournal']:
+        """Diários de sessões encerradas sem descarte, do mais recente ao mais antigo
+        
+        A trava de uma sessão em execução impede que seu diário seja listado; os
+        diários retornados ficam travados por esta sessão até discard ou release.
+        """
+        if not os.path.isdir(base_directory):
+            return []
+        
+        journals = []
+        for name in os.listdir(base_directory):
+            directory = os.path.join(base_directory, name)
+            if not name.startswith(cls.SESSION_PREFIX) or not os.path.isdir(directory):
+                continue
+            journal = cls(directory)
+            if journal.acquire():
+                journals.append(journal)
+        journals.sort(key=lambda journal: os.path.getmtime(journal.directory), reverse=True)
+        return journals
+    
+    def acquire(self) -> bool:
+        """Trava o diretório do diário; False se outra sessão em execução já o travou
+        
+        A trava é do sistema operacional e se desfaz com o fim do processo, mesmo
+        em caso de falha.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        handle = open(self.lock_path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return False
+        self.lock_handle = handle
+        return True
+    
+    def release(self) -> None:
+        """Libera a trava sem apagar o diário (fechar o arquivo desfaz a trava)"""
+        if self.lock_handle is not None:
+            self.lock_handle.close()
+            self.lock_handle = None
+    
+    def has_pending(self) -> bool:
+        """Indica se a sessão anterior terminou sem descartar o diário"""
+        return os.path.exists(self.snapshot_path) or any(
+            os.path.exists(path) and os.path.getsize(path) > 0 for path in (self.previous_path, self.journal_path)
+        )
+    
+    def start(self, model: DataModel) -> None:
+        """Passa a registrar as operações de model, a partir de um instantâneo do estado atual"""
+        os.makedirs(self.directory, exist_ok=True)
+        model.journal = self
+        self.snapshot(model, wait=True)
+    
+    def append(self, operation: str, **arguments) -> None:
+        if self.handle is None:
+            return
+        self.sequence += 1
+        record = {'seq': self.sequence, 'op': operation, 'args': arguments}
+        self.handle.write(json.dumps(record, default=self._json_default) + '\n')
+        self.dirty = True
+        self.records_since_snapshot += 1
+        if time.monotonic() - self.last_sync >= self.FSYNC_INTERVAL:
+            self.sync()
+    
+    @staticmethod
+    def _json_default(value):
+        # Escalares numpy (índices, valores de células)
+        if hasattr(value, 'item'):
+            return value.item()
+        raise TypeError(f"Valor não serializável no diário: {value!r}")
+    
+    def sync(self) -> None:
+        """Garante em disco as operações acumuladas desde o último fsync"""
+        if self.handle is not None and self.dirty:
+            self.handle.flush()
+            os.fsync(self.handle.fileno())
+            self.dirty = False
+        self.last_sync = time.monotonic()
+    
+    def needs_compaction(self) -> bool:
+        return self.records_since_snapshot >= self.COMPACT_EVERY
+    
+    def snapshot_running(self) -> bool:
+        return self.writer is not None and self.writer.is_alive()
+    
+    def wait_snapshot(self) -> None:
+        """Aguarda a gravação do instantâneo em andamento, se houver"""
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+    
+    def snapshot(self, model: DataModel, wait: bool = False, replaced: bool = False) -> None:
+        """Grava o estado completo do modelo e reinicia o diário
+        
+        Apenas a cópia dos dados e a serialização do histórico são feitas nesta
+        thread; a gravação ocorre em outra, salvo com wait. replaced indica dados substituídos por inteiro (carga de
+        arquivo): se o instantâneo não chegar ao disco, a recuperação para antes
+        das operações seguintes, que não se aplicam ao estado anterior.
+        """
+        self.wait_snapshot()
+        state = {
+            'sequence': self.sequence,
+            'data': model.data.copy(),
+            'metadata': model.project_metadata(),
+            'current_file': model.current_file,
+            # O histórico vai junto para que desfazer/refazer do diário se apliquem à mesma pilha.
+            # Serializado aqui: as entradas (RowsInserted.rows, DataCleared.previous) continuam
+            # sendo alteradas pelo modelo enquanto a gravação ocorre na outra thread
+            'history': pickle.dumps(model.history, protocol=pickle.HIGHEST_PROTOCOL)
+        }
+        self._rotate()
+        # Marca o início do novo diário; o instantâneo já inclui a marca
+        self.append('snapshot', replaced=replaced)
+        state['sequence'] = self.sequence
+        if wait:
+            self._write_snapshot(state)
+            if self.snapshot_error is not None:
+                error, self.snapshot_error = self.snapshot_error, None
+                raise error
+        else:
+            self.writer = threading.Thread(target=self._write_snapshot, args=(state,), daemon=True)
+            self.writer.start()
+    
+    def _rotate(self) -> None:
+        """Move as operações registradas até agora para previous_path e abre um diário vazio"""
+        if self.handle is not None:
+            self.sync()
+            self.handle.close()
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.previous_path):
+                # Gravação anterior do instantâneo falhou: o diário anterior continua necessário
+                with open(self.previous_path, 'a', encoding='utf-8') as previous, \
+                        open(self.journal_path, encoding='utf-8') as current:
+                    shutil.copyfileobj(current, previous)
+            else:
+                os.replace(self.journal_path, self.previous_path)
+        self.handle = open(self.journal_path, 'w', encoding='utf-8')
+        self.records_since_snapshot = 0
+        self.dirty = False
+    
+    def _write_snapshot(self, state: Dict[str, object]) -> None:
+        try:
+            temp_path = self.snapshot_path + '.tmp'
+            pd.to_pickle(state, temp_path)
+            os.replace(temp_path, self.snapshot_path)
+            # Registros anteriores ao instantâneo são ignorados pela sequência
+            if os.path.exists(self.previous_path):
+                os.remove(self.previous_path)
+        except Exception as e:
+            self.snapshot_error = e
+    
+    def recover(self, model: DataModel) -> int:
+        """Restaura o último instantâneo e reaplica o diário; retorna as operações reaplicadas"""
+        journal, model.journal = model.journal, None
+        try:
+            sequence = 0
+            if os.path.exists(self.snapshot_path):
+                state = pd.read_pickle(self.snapshot_path)
+                data = state['data']
+                data.attrs['projeto'] = state['metadata']
+                model.replace_data(data, state['current_file'])
+                if state.get('history') is not None:
+                    model.history = pickle.loads(state['history'])
+                sequence = state['sequence']
+            
+            replayed = 0
+            for record in self._records():
+                if record['seq'] <= sequence:
+                    continue
+                if record['op'] == 'snapshot' and record['args'].get('replaced'):
+                    break  # Dados substituídos cujo instantâneo não chegou a ser gravado
+                if record['op'] in self.REPLAYABLE:
+                    getattr(model, record['op'])(**record['args'])
+                    replayed += 1
+                sequence = record['seq']
+            
+            self.sequence = sequence
+            return replayed
+        finally:
+            model.journal = journal
+    
+    def _records(self) -> Iterable[Dict[str, object]]:
+        """Operações registradas, do diário anterior ao atual"""
+        for path in (self.previous_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding='utf-8') as handle:
+                for line in handle:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        break  # Última linha incompleta: gravação interrompida
+    
+    def discard(self) -> None:
+        """Encerra o diário e remove seus arquivos (fim normal da sessão)"""
+        self.wait_snapshot()
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+        for path in (self.journal_path, self.previous_path, self.snapshot_path, self.snapshot_path + '.tmp'):
+            if os.path.exists(path):
+                os.remove(path)
+        if self.lock_handle is not None:
+            self.release()
+            try:
+                os.remove(self.lock_path)
+                os.rmdir(self.directory)
+            except OSError:
+                pass  # Outra sessão travou o diretório vazio ao procurar diários abandonados
@@ -0,0 +1,63 @@
+"""Formatação de números no padrão pt_BR (1.234,56) para exibição na tabela
+
+Não depende do locale do sistema: o formato é sempre o brasileiro, o mesmo
+que a edição de células espera ao converter o texto de volta para número.
+"""
+from functools import lru_cache
+from typing import Iterable, List
+import pandas as pd
+
+# Troca os separadores do formato ',.2f' (1,234.56) pelos brasileiros
+_PT_BR_SEPARATORS = str.maketrans({',': '.', '.': ','})
+
+def format_number(value: float) -> str:
+    """Duas casas decimais com separador de milhar: 1234.5 -> '1.234,50'"""
+    return format(value, ',.2f').translate(_PT_BR_SEPARATORS)
+
+class CellFormatter:
+    """Converte valores de células em texto, com memória dos valores já formatados
+
+    Os textos ficam em um cache LRU limitado, indexado por (coluna, valor), de
+    modo que redesenhar linhas que não mudaram custa apenas consultas ao cache.
+    """
+    CACHE_SIZE = 100_000
+
+    def __init__(self, columns: Iterable[str], integer_columns: Iterable[str] = ('Item',),
+                 cache_size: int = CACHE_SIZE):
+        self.columns = list(columns)
+        self.integer_columns = set(integer_columns)
+        self.format_cell = lru_cache(maxsize=cache_size)(self._format_cell)
+
+    def _format_cell(self, column: str, value) -> str:
+        if isinstance(value, str):
+            return value
+        if column in self.integer_columns:
+            return str(int(value))
+        return format_number(value)
+
+    def format_value(self, column: str, value) -> str:
+        """Texto de uma célula; valores ausentes viram texto vazio"""
+        if pd.isna(value):
+            return ""
+        if not isinstance(value, (str, int, float)):
+            value = value.item() if hasattr(value, 'item') else str(value)
+        return self.format_cell(column, value)
+
+    def format_column(self, column: str, values: pd.Series) -> List[str]:
+        """Formata uma coluna inteira de uma vez"""
+        cell = self.format_cell
+        if pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(values):
+            # tolist() entrega floats/ints do Python; v != v identifica NaN
+            return ["" if v != v else cell(column, v) for v in values.tolist()]
+        return [self.format_value(column, v) for v in values.tolist()]
+
+    def format_frame(self, df: pd.DataFrame) -> List[List[str]]:
+        """Linhas de df como listas de textos, formatadas coluna a coluna"""
+        formatted = [self.format_column(col, df[col]) for col in self.columns]
+        return [list(row) for row in zip(*formatted)]
+
+    def format_row(self, row) -> List[str]:
+        return [self.format_value(col, row[col]) for col in self.columns]
+
+    def clear(self) -> None:
+        self.format_cell.cache_clear()
@@ -0,0 +1,119 @@
+"""Instrumentação opcional: tempos e contagens de chamadas das operações
+
+Desativada por padrão, sem custo algum. É ativada pela variável de ambiente
+PRECIFICACAO_PERFIL (1 = tempos; cprofile = tempos e perfil cProfile) ou, na
+interface, por Ctrl+Shift+F12. Ao final da sessão grava em PROFILE_DIR um
+resumo JSON e, se houver, o arquivo .prof do cProfile (lido com pstats).
+"""
+import cProfile
+import json
+import os
+import platform
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+# Operações medidas quando a instrumentação está ativa
+MODEL_OPERATIONS = [
+    'add_item', 'add_items', 'update_item', 'update_column', 'delete_items', 'reprice_icms',
+    'calculate_totals', 'price_frame', 'read_file', 'replace_data', 'load_from_file',
+    'export_to_file', 'save_to_file', 'undo', 'redo', 'set_fixed_point', 'set_icms_rules'
+]
+VIEW_OPERATIONS = ['update_table', 'apply_changes', 'render_window', 'update_row_in_table', 'update_totals_row']
+
+class Instrumentation:
+    """Acumula tempo de parede e número de chamadas por operação
+    
+    Os métodos são substituídos por versões medidas apenas nas instâncias
+    anexadas (attach), de modo que nada muda enquanto a instrumentação está
+    desligada. Tempos de operações aninhadas são inclusivos.
+    """
+    ENV_VAR = 'PRECIFICACAO_PERFIL'
+    PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".precificacao", "perfil")
+    
+    def __init__(self, profile: bool = False):
+        self.stats: Dict[str, List[float]] = {}  # nome -> [chamadas, total, máximo]
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.attached: List[tuple] = []  # (objeto, nome do método)
+        self.profiler: Optional[cProfile.Profile] = None
+        if profile:
+            # cProfile acompanha apenas a thread da interface
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+    
+    @classmethod
+    def from_environment(cls) -> Optional['Instrumentation']:
+        """Instrumentação pedida pela variável de ambiente, ou None"""
+        mode = os.environ.get(cls.ENV_VAR, '').strip().lower()
+        if mode in ('', '0', 'false', 'nao', 'não'):
+            return None
+        return cls(profile=mode == 'cprofile')
+    
+    def attach(self, target: object, operations: List[str], prefix: str) -> None:
+        """Passa a medir os métodos operations de target, registrados como prefix.método"""
+        for name in operations:
+            method = getattr(target, name, None)
+            if method is None:
+                continue
+            setattr(target, name, self._timed(f'{prefix}.{name}', method))
+            self.attached.append((target, name))
+    
+    def detach(self) -> None:
+        """Restaura os métodos originais"""
+        for target, name in self.attached:
+            target.__dict__.pop(name, None)
+        self.attached = []
+    
+    def _timed(self, label: str, method: Callable) -> Callable:
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(label, time.perf_counter() - start)
+        return timed
+    
+    def record(self, label: str, elapsed: float) -> None:
+        # Carga e gravação de arquivos rodam em outra thread
+        with self.lock:
+            entry = self.stats.setdefault(label, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+    
+    def summary(self) -> List[Dict[str, object]]:
+        """Operações ordenadas pelo tempo total"""
+        with self.lock:
+            rows = [{'operation': label, 'calls': int(calls), 'total_s': total,
+                     'mean_s': total / calls if calls else 0.0, 'max_s': maximum}
+                    for label, (calls, total, maximum) in self.stats.items()]
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+    
+    def write_report(self, directory: Optional[str] = None) -> str:
+        """Grava o resumo da sessão (e o perfil cProfile, se ativo); retorna o caminho do resumo"""
+        directory = directory or self.PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime('sessao-%Y%m%d-%H%M%S', time.localtime(self.started)))
+        
+        profile_path = None
+        if self.profiler is not None:
+            self.profiler.disable()
+            profile_path = base + '.prof'
+            self.profiler.dump_stats(profile_path)
+        
+        report = {
+            'session': {
+                'start': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+                'seconds': time.time() - self.started,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cprofile': profile_path
+            },
+            'operations': self.summary()
+        }
+        with open(base + '.json', 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, ensure_ascii=False, indent=2)
+        return base + '.json'
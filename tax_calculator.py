@@ -0,0 +1,308 @@
+import decimal
+import pandas as pd
+import numpy as np
+from typing import Callable, ClassVar, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+@dataclass
+class TaxConfig:
+    """Configurações de impostos padrão"""
+    ICMS: float = 20.0
+    PIS: float = 0.65
+    COFINS: float = 3
+    IRPJ: float = 1.2
+    CSLL: float = 1.08
+
+TAX_NAMES = ['ICMS', 'PIS', 'COFINS', 'IRPJ', 'CSLL']
+
+# Alíquotas interestaduais de ICMS (Resoluções do Senado 22/1989 e 13/2012)
+INTERSTATE_RATE = 12.0
+REDUCED_INTERSTATE_RATE = 7.0   # de S/SE (exceto ES) para N, NE, CO e ES
+IMPORTED_INTERSTATE_RATE = 4.0  # produtos importados
+SOUTH_SOUTHEAST = {'MG', 'PR', 'RJ', 'RS', 'SC', 'SP'}
+
+@dataclass
+class ICMSRules:
+    """Regras do ICMS por origem x destino
+    
+    Operações internas (origem = destino) usam a alíquota interna do estado (tabela
+    de ICMS). Nas interestaduais vale a alíquota das Resoluções do Senado, ou a de
+    overrides, indexado por rota ('SP>BA'). Com difal, as vendas a consumidor final
+    somam o diferencial de alíquotas: interna do destino menos a interestadual.
+    """
+    difal: bool = True
+    imported: bool = False
+    overrides: Dict[str, float] = field(default_factory=dict)
+    
+    @staticmethod
+    def route(origin: str, destination: str) -> str:
+        return f'{origin}>{destination}'
+
+# Escalas do cálculo em ponto fixo: alíquotas e margem em centésimos de ponto
+# percentual, quantidades com até 3 casas decimais
+RATE_SCALE = 100
+QUANTITY_SCALE = 1000
+
+@dataclass
+class FixedPointConfig:
+    """Cálculo em ponto fixo (inteiros int64) no lugar de ponto flutuante
+    
+    Com per_line, cada valor da linha é arredondado para centavos e os totais
+    são somas exatas desses centavos. Sem per_line, os valores das linhas
+    guardam EXTRA_DIGITS casas além dos centavos e só os totais são
+    arredondados. rounding é ROUND_HALF_EVEN ou ROUND_HALF_UP (módulo decimal).
+    
+    Em relação ao cálculo em ponto flutuante, cada valor unitário difere em no
+    máximo meio centavo (ou meia unidade da última casa extra) por arredondamento,
+    e cada valor total em no máximo quantidade vezes essa diferença.
+    """
+    rounding: str = decimal.ROUND_HALF_EVEN
+    per_line: bool = True
+    
+    EXTRA_DIGITS: ClassVar[int] = 4
+    ROUNDING_MODES: ClassVar[tuple] = (decimal.ROUND_HALF_EVEN, decimal.ROUND_HALF_UP)
+    
+    def __post_init__(self):
+        if self.rounding not in self.ROUNDING_MODES:
+            raise ValueError(f"Arredondamento não suportado: {self.rounding}")
+    
+    @property
+    def scale(self) -> int:
+        """Unidades por real nos valores das linhas"""
+        return 100 if self.per_line else 100 * 10 ** self.EXTRA_DIGITS
+    
+    def column_scale(self, column: str) -> int:
+        return QUANTITY_SCALE if column == 'Quantidade' else self.scale
+    
+    def divide(self, numerator, denominator: int):
+        """numerator / denominator arredondado para inteiro conforme rounding"""
+        quotient, remainder = np.divmod(numerator, denominator)
+        tie = 2 * remainder == denominator
+        if self.rounding == decimal.ROUND_HALF_UP:
+            # Empates se afastam de zero
+            tie_up = np.asarray(numerator) >= 0
+        else:
+            tie_up = quotient % 2 == 1
+        return quotient + ((2 * remainder > denominator) | (tie & tie_up))
+    
+    def total(self, units: int, column: str) -> float:
+        """Total em reais (ou quantidade) a partir da soma exata em unidades"""
+        if column == 'Quantidade':
+            return units / QUANTITY_SCALE
+        cents = units if self.per_line else int(self.divide(units, 10 ** self.EXTRA_DIGITS))
+        return cents / 100
+
+def _fixed_product(values: np.ndarray, factor) -> np.ndarray:
+    """Produto inteiro, recusando valores que estourariam o int64"""
+    if len(values) and np.max(np.abs(values.astype(float) * factor)) >= 2.0 ** 62:
+        raise ValueError("Valores grandes demais para o cálculo em ponto fixo")
+    return values * factor
+
+def _column_values(df: pd.DataFrame, name: str, default: Optional[float] = None) -> np.ndarray:
+    if default is not None and name not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    return np.asarray(df[name], dtype=float)
+
+def _build_column_dependencies() -> Dict[str, List[str]]:
+    """Grafo de dependências diretas: coluna -> colunas calculadas a partir dela"""
+    dependencies = {
+        'Valor Unitário de Custo (R$)': ['Valor Total de Custo (R$)', 'Valor Unitário de Venda (R$)'],
+        'Quantidade': ['Valor Total de Custo (R$)', 'Valor Total de Venda (R$)'],
+        'Margem de Lucro Bruto (%)': ['Valor Unitário de Venda (R$)'],
+        'Valor Unitário de Venda (R$)': ['Valor Total de Venda (R$)', 'Valor Total Unitário'],
+        'Valor Total de Venda (R$)': ['Valor Total'],
+        'Valor Total de impostos': ['Valor Total'],
+    }
+    for tax_name in TAX_NAMES:
+        dependencies['Quantidade'].append(f'Valor Total {tax_name} (R$)')
+        dependencies['Valor Unitário de Venda (R$)'].append(f'Valor unit. {tax_name}')
+        dependencies[f'{tax_name} (%)'] = [f'Valor unit. {tax_name}', 'Total Alíquota Impostos (%)']
+        dependencies[f'Valor unit. {tax_name}'] = [f'Valor Total {tax_name} (R$)', 'Valor Total Unitário']
+        dependencies[f'Valor Total {tax_name} (R$)'] = ['Valor Total de impostos']
+    return dependencies
+
+def _build_derived_formulas() -> Dict[str, Callable[[Dict[str, float]], float]]:
+    """Fórmula de cada coluna derivada, em ordem de cálculo
+    
+    Fonte única das regras de preço em ponto flutuante: calculate_taxes,
+    calculate_taxes_frame e recalculate aplicam estas funções.
+    """
+    formulas = {
+        'Valor Total de Custo (R$)': lambda v: v['Valor Unitário de Custo (R$)'] * v['Quantidade'],
+        'Valor Unitário de Venda (R$)': lambda v: v['Valor Unitário de Custo (R$)'] * (1 + v['Margem de Lucro Bruto (%)'] / 100),
+        'Valor Total de Venda (R$)': lambda v: v['Valor Unitário de Venda (R$)'] * v['Quantidade'],
+    }
+    for tax_name in TAX_NAMES:
+        formulas[f'Valor unit. {tax_name}'] = lambda v, t=tax_name: v['Valor Unitário de Venda (R$)'] * (v[f'{t} (%)']/100)
+        formulas[f'Valor Total {tax_name} (R$)'] = lambda v, t=tax_name: v[f'Valor unit. {t}'] * v['Quantidade']
+    formulas['Valor Total de impostos'] = lambda v: sum(v[f'Valor Total {t} (R$)'] for t in TAX_NAMES)
+    formulas['Valor Total Unitário'] = lambda v: v['Valor Unitário de Venda (R$)'] + sum(
+        v[f'Valor unit. {t}'] for t in TAX_NAMES
+    )
+    formulas['Valor Total'] = lambda v: v['Valor Total de Venda (R$)'] + v['Valor Total de impostos']
+    formulas['Total Alíquota Impostos (%)'] = lambda v: sum(v[f'{t} (%)'] for t in TAX_NAMES)
+    return formulas
+
+class TaxCalculator:
+    """Classe responsável por calcular os impostos e valores relacionados"""
+    # Colunas lidas por calculate_taxes (alíquotas ausentes usam TaxConfig)
+    CALCULATION_INPUTS = ['Valor Unitário de Custo (R$)', 'Quantidade', 'Margem de Lucro Bruto (%)'] + [
+        f'{tax_name} (%)' for tax_name in TAX_NAMES
+    ]
+    COLUMN_DEPENDENCIES = _build_column_dependencies()
+    DERIVED_FORMULAS = _build_derived_formulas()
+    
+    @classmethod
+    def downstream_columns(cls, column: str) -> List[str]:
+        """Colunas derivadas afetadas pela alteração de column, em ordem de cálculo"""
+        affected = set()
+        pending = [column]
+        while pending:
+            for dependent in cls.COLUMN_DEPENDENCIES.get(pending.pop(), []):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return [col for col in cls.DERIVED_FORMULAS if col in affected]
+    
+    @classmethod
+    def recalculate(cls, row: Dict[str, float], columns: List[str]) -> Dict[str, float]:
+        """Recalcula apenas as colunas informadas (já em ordem de cálculo)"""
+        values = dict(row)
+        calculations = {}
+        for col in columns:
+            values[col] = calculations[col] = cls.DERIVED_FORMULAS[col](values)
+        return calculations
+    
+    @staticmethod
+    def compile_rate_table(state_icms_table: Dict[str, float], tax_config: TaxConfig,
+                           states: List[str]) -> np.ndarray:
+        """Alíquotas por estado: matriz len(states) x len(TAX_NAMES)
+        
+        A linha i traz as alíquotas de states[i], na ordem de TAX_NAMES; o ICMS vem
+        de state_icms_table (NaN para estados ausentes) e os demais de tax_config.
+        """
+        table = np.tile(np.array([getattr(tax_config, tax_name) for tax_name in TAX_NAMES], dtype=float),
+                        (len(states), 1))
+        table[:, TAX_NAMES.index('ICMS')] = [state_icms_table.get(state, np.nan) for state in states]
+        return table
+    
+    @staticmethod
+    def compile_icms_matrix(state_icms_table: Dict[str, float], rules: ICMSRules,
+                            states: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Matrizes len(states) x len(states) de ICMS, linha = origem e coluna = destino
+        
+        Retorna (alíquota da operação, DIFAL): a diagonal traz as alíquotas internas e
+        as demais células a interestadual; a alíquota efetiva de cada rota é a soma das
+        duas. Estados ausentes de state_icms_table têm alíquota interna NaN.
+        """
+        internal = np.array([state_icms_table.get(state, np.nan) for state in states], dtype=float)
+        south = np.array([state in SOUTH_SOUTHEAST for state in states])
+        
+        operation = np.full((len(states), len(states)), INTERSTATE_RATE)
+        operation[np.ix_(south, ~south)] = REDUCED_INTERSTATE_RATE
+        if rules.imported:
+            operation[:] = IMPORTED_INTERSTATE_RATE
+        positions = {state: position for position, state in enumerate(states)}
+        for route, rate in rules.overrides.items():
+            origin, _, destination = route.partition('>')
+            if origin in positions and destination in positions:
+                operation[positions[origin], positions[destination]] = rate
+        np.fill_diagonal(operation, internal)
+        
+        if rules.difal:
+            difal = np.maximum(internal[np.newaxis, :] - operation, 0.0)
+        else:
+            difal = np.zeros_like(operation)
+        np.fill_diagonal(difal, 0.0)
+        return operation, difal
+    
+    @staticmethod
+    def icms_rates(icms_matrix: np.ndarray, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """Alíquota de ICMS de cada linha, icms_matrix[origem, destino], pelos códigos dos estados
+        
+        Códigos inválidos (-1) resultam em NaN.
+        """
+        rates = icms_matrix[origins, destinations]
+        rates[(origins < 0) | (destinations < 0)] = np.nan
+        return rates
+    
+    @classmethod
+    def calculate_taxes(cls, row: Dict[str, float], tax_config: TaxConfig) -> Dict[str, float]:
+        """Calcula todos os impostos e valores derivados
+        
+        Aplica DERIVED_FORMULAS, as mesmas fórmulas usadas por recalculate nas edições;
+        alíquotas ausentes de row vêm de tax_config.
+        """
+        rates = {f'{tax_name} (%)': row.get(f'{tax_name} (%)', getattr(tax_config, tax_name))
+                 for tax_name in TAX_NAMES}
+        calculations = cls.recalculate({**row, **rates}, list(cls.DERIVED_FORMULAS))
+        calculations.update(rates)
+        return calculations
+    
+    @staticmethod
+    def calculate_taxes_frame(df: pd.DataFrame, tax_config: TaxConfig,
+                              fixed_point: Optional[FixedPointConfig] = None) -> pd.DataFrame:
+        """Calcula os impostos e valores derivados de todas as linhas de uma vez
+        
+        Versão vetorizada de calculate_taxes: a mesma função, aplicada a colunas
+        inteiras em vez de valores de uma linha. Com fixed_point, o cálculo é feito
+        em ponto fixo (calculate_taxes_fixed).
+        """
+        if fixed_point is not None:
+            return TaxCalculator.calculate_taxes_fixed(df, tax_config, fixed_point)
+        
+        # As fórmulas de calculate_taxes usam só aritmética e row.get: aplicadas a
+        # colunas inteiras, produzem os mesmos valores da versão por linha
+        columns = {name: _column_values(df, name) for name in TaxCalculator.CALCULATION_INPUTS if name in df.columns}
+        calculations = TaxCalculator.calculate_taxes(columns, tax_config)
+        
+        return pd.DataFrame(calculations, index=df.index)
+    
+    @staticmethod
+    def calculate_taxes_fixed(df: pd.DataFrame, tax_config: TaxConfig,
+                              fixed_point: FixedPointConfig) -> pd.DataFrame:
+        """Versão em ponto fixo de calculate_taxes_frame
+        
+        Custos viram inteiros na escala de fixed_point, quantidades em milésimos e
+        alíquotas em centésimos de ponto percentual; cada multiplicação é seguida de
+        uma divisão inteira arredondada conforme fixed_point.rounding. O resultado
+        volta em reais (float), com os mesmos nomes de coluna.
+        """
+        scale = fixed_point.scale
+        divide = fixed_point.divide
+        percent = 100 * RATE_SCALE
+        
+        def units(name: str, factor: int, default: Optional[float] = None) -> np.ndarray:
+            return np.rint(_column_values(df, name, default) * factor).astype(np.int64)
+        
+        # Valores básicos
+        unit_cost = units('Valor Unitário de Custo (R$)', scale)
+        quantity = units('Quantidade', QUANTITY_SCALE)
+        profit_margin = units('Margem de Lucro Bruto (%)', RATE_SCALE)
+        
+        unit_sale = divide(_fixed_product(unit_cost, percent + profit_margin), percent)
+        fixed = {
+            'Valor Total de Custo (R$)': divide(_fixed_product(unit_cost, quantity), QUANTITY_SCALE),
+            'Valor Unitário de Venda (R$)': unit_sale,
+            'Valor Total de Venda (R$)': divide(_fixed_product(unit_sale, quantity), QUANTITY_SCALE)
+        }
+        
+        # Cálculos de impostos
+        rates = {tax_name: units(f'{tax_name} (%)', RATE_SCALE, getattr(tax_config, tax_name))
+                 for tax_name in TAX_NAMES}
+        for tax_name, rate in rates.items():
+            unit_tax = divide(_fixed_product(unit_sale, rate), percent)
+            fixed[f'Valor unit. {tax_name}'] = unit_tax
+            fixed[f'Valor Total {tax_name} (R$)'] = divide(_fixed_product(unit_tax, quantity), QUANTITY_SCALE)
+        
+        # Totais consolidados: somas inteiras, sem arredondamento adicional
+        fixed['Valor Total de impostos'] = sum(fixed[f'Valor Total {tax_name} (R$)'] for tax_name in TAX_NAMES)
+        fixed['Valor Total Unitário'] = unit_sale + sum(fixed[f'Valor unit. {tax_name}'] for tax_name in TAX_NAMES)
+        fixed['Valor Total'] = fixed['Valor Total de Venda (R$)'] + fixed['Valor Total de impostos']
+        
+        calculations = {col: values / scale for col, values in fixed.items()}
+        for tax_name, rate in rates.items():
+            calculations[f'{tax_name} (%)'] = rate / RATE_SCALE
+        calculations['Total Alíquota Impostos (%)'] = sum(rates.values()) / RATE_SCALE
+        
+        return pd.DataFrame(calculations, index=df.index)
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+import cli
+from benchmarks import synthetic_items
+from data_model import DataModel
+
+def price(tmp_path, source: str, *options: str) -> pd.DataFrame:
+    output = tmp_path / f'saida_{len(list(tmp_path.iterdir()))}.csv'
+    assert cli.run(['price', source, '-o', str(output), *options]) == 0
+    return pd.read_csv(output)
+
+@pytest.mark.parametrize('extension', ['.xlsx', DataModel.PROJECT_EXTENSION])
+def test_input_formats_price_the_same(tmp_path, extension):
+    if extension == DataModel.PROJECT_EXTENSION and not DataModel.project_format_available():
+        pytest.skip("pyarrow indisponível")
+    df = synthetic_items(50)
+    df.to_csv(tmp_path / 'itens.csv', index=False)
+    if extension == '.xlsx':
+        df.to_excel(tmp_path / 'itens.xlsx', index=False)
+    else:
+        # Projeto sem as colunas de alíquotas: devem vir da tabela de ICMS e da configuração
+        df.to_feather(tmp_path / f'itens{extension}')
+    
+    expected = price(tmp_path, str(tmp_path / 'itens.csv'))
+    result = price(tmp_path, str(tmp_path / f'itens{extension}'))
+    
+    assert (expected['ICMS (%)'] > 0).all()
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_xlsx_input_with_totals_row(tmp_path):
+    df = synthetic_items(10)
+    priced = DataModel().price_frame(df)
+    total = {col: "" for col in priced.columns}
+    total.update({'Descrição': "TOTAL", 'Valor Total': priced['Valor Total'].sum()})
+    pd.concat([priced, pd.DataFrame([total])]).to_excel(tmp_path / 'planilha.xlsx', index=False)
+    df.to_csv(tmp_path / 'itens.csv', index=False)
+    
+    result = price(tmp_path, str(tmp_path / 'planilha.xlsx'))
+    assert len(result) == 10
+    pd.testing.assert_frame_equal(result, price(tmp_path, str(tmp_path / 'itens.csv')))
+
+@pytest.mark.parametrize('extension', ['.csv', '.xlsx'])
+def test_per_item_origin_column_is_used(tmp_path, extension):
+    df = synthetic_items(27).assign(**{DataModel.ORIGIN_COLUMN: 'BA'})
+    source = tmp_path / f'itens{extension}'
+    if extension == '.csv':
+        df.to_csv(source, index=False)
+    else:
+        df.to_excel(source, index=False)
+    
+    result = price(tmp_path, str(source), '--no-difal')
+    
+    # Sem DIFAL: interestadual de 12% a partir da BA; interna apenas para a própria BA
+    model = DataModel()
+    expected = [model.state_icms_table['BA'] if state == 'BA' else 12.0 for state in result['Estado de Destino']]
+    assert result['ICMS (%)'].tolist() == expected
+
+def test_invalid_origin_reports_item_number_across_chunks(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(DataModel, 'CSV_CHUNK_SIZE', 20)
+    df = synthetic_items(60).assign(**{DataModel.ORIGIN_COLUMN: 'BA'})
+    df.loc[45, DataModel.ORIGIN_COLUMN] = 'XX'
+    df.to_csv(tmp_path / 'itens.csv', index=False)
+    
+    assert cli.run(['price', str(tmp_path / 'itens.csv'), '-o', str(tmp_path / 'saida.csv')]) == 1
+    assert "Erro no item 46:" in capsys.readouterr().err
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from data_model import ChangeJournal, DataModel
+
+def new_item(description: str, state: str = 'SP') -> dict:
+    return {
+        'Descrição': description,
+        'Valor Unitário de Custo (R$)': 100.0,
+        'Quantidade': 2.0,
+        'Margem de Lucro Bruto (%)': 30.0,
+        'Estado de Destino': state,
+    }
+
+def test_invalid_state_leaves_model_untouched(tmp_path):
+    model = DataModel()
+    model.add_item(new_item('Antes'))
+    totals = model.calculate_totals()
+    
+    path = tmp_path / 'itens.csv'
+    pd.DataFrame([new_item('A'), new_item('B', 'SAO PAULO')]).to_csv(path, index=False)
+    with pytest.raises(ValueError, match='SAO PAULO'):
+        model.read_file(str(path))
+    
+    df = pd.DataFrame([new_item('A'), new_item('B', 'SAO PAULO')])
+    df.attrs['projeto'] = {**model.project_metadata(), 'fixed_point': {'per_line': True}}
+    with pytest.raises(ValueError, match='SAO PAULO'):
+        model.replace_data(df)
+    
+    assert model.fixed_point is None
+    assert model.data['Descrição'].tolist() == ['Antes']
+    assert model.calculate_totals() == totals
+
+def test_recover_after_snapshot_between_undo_and_redo(tmp_path):
+    model = DataModel()
+    journal = ChangeJournal(str(tmp_path))
+    journal.start(model)
+    model.add_item(new_item('A'))
+    first_only = model.data.copy()
+    model.add_items([new_item('B'), new_item('C')])
+    
+    model.undo()
+    journal.snapshot(model)
+    model.redo()
+    expected = model.data.copy()
+    journal.wait_snapshot()
+    journal.sync()
+    
+    recovered = DataModel()
+    ChangeJournal(str(tmp_path)).recover(recovered)
+    pd.testing.assert_frame_equal(recovered.data, expected)
+    assert recovered.undo()
+    pd.testing.assert_frame_equal(recovered.data, first_only)
+
+def test_only_sessions_no_longer_running_are_orphaned(tmp_path):
+    running = ChangeJournal.new_session(str(tmp_path))
+    running.start(DataModel())
+    crashed = ChangeJournal.new_session(str(tmp_path))
+    crashed.start(DataModel())
+    crashed.handle.close()
+    crashed.release()  # Como no fim do processo: a trava se desfaz, os arquivos ficam
+    
+    orphans = ChangeJournal.orphaned_sessions(str(tmp_path))
+    assert [orphan.directory for orphan in orphans] == [crashed.directory]
+    assert orphans[0].has_pending()
+    
+    orphans[0].discard()
+    running.discard()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic_items
+from tax_calculator import TAX_NAMES, FixedPointConfig, TaxCalculator, TaxConfig
+
+def items(rows: int = 200, seed: int = 0) -> pd.DataFrame:
+    df = synthetic_items(rows, seed)
+    rng = np.random.default_rng(seed)
+    for tax_name in TAX_NAMES:
+        df[f'{tax_name} (%)'] = rng.uniform(0, 25, rows).round(2)
+    return df
+
+def per_row(df: pd.DataFrame, config: TaxConfig) -> pd.DataFrame:
+    rows = [TaxCalculator.calculate_taxes(row, config) for row in df.to_dict('records')]
+    return pd.DataFrame(rows, index=df.index)
+
+@pytest.mark.parametrize('rate_columns', [
+    TAX_NAMES,          # todas as alíquotas informadas
+    [],                 # nenhuma: valores de TaxConfig
+    ['ICMS', 'PIS'],    # parte informada, parte padrão
+])
+def test_frame_matches_per_row(rate_columns):
+    config = TaxConfig()
+    df = items().drop(columns=[f'{t} (%)' for t in TAX_NAMES if t not in rate_columns])
+    
+    frame = TaxCalculator.calculate_taxes_frame(df, config)
+    expected = per_row(df, config)
+    
+    assert list(frame.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(frame, expected, check_exact=True)
+
+def test_frame_keeps_index_and_handles_empty():
+    config = TaxConfig()
+    df = items(5).set_index(pd.Index([10, 3, 7, 1, 0]))
+    assert list(TaxCalculator.calculate_taxes_frame(df, config).index) == [10, 3, 7, 1, 0]
+    
+    empty = TaxCalculator.calculate_taxes_frame(items(0), config)
+    assert empty.empty and list(empty.columns) == list(per_row(items(1), config).columns)
+
+EDITABLE_COLUMNS = ['Valor Unitário de Custo (R$)', 'Quantidade', 'Margem de Lucro Bruto (%)'] + [
+    f'{tax_name} (%)' for tax_name in TAX_NAMES
+]
+
+@pytest.mark.parametrize('column', EDITABLE_COLUMNS)
+def test_recalculate_downstream_matches_full_calculation(column):
+    config = TaxConfig()
+    row = items(1).iloc[0].to_dict()
+    row.update(TaxCalculator.calculate_taxes(row, config))
+    
+    edited = {**row, column: row[column] * 1.5 + 1}
+    row.update(edited)
+    row.update(TaxCalculator.recalculate(row, TaxCalculator.downstream_columns(column)))
+    
+    expected = TaxCalculator.calculate_taxes(edited, config)
+    assert {col: row[col] for col in expected} == expected
+
+def test_downstream_columns_cover_every_formula_input():
+    # Toda coluna derivada é alcançada a partir de alguma coluna editável
+    reachable = set()
+    for column in EDITABLE_COLUMNS:
+        reachable.update(TaxCalculator.downstream_columns(column))
+    assert reachable == set(TaxCalculator.DERIVED_FORMULAS)
+
+@pytest.mark.parametrize('per_line', [True, False])
+def test_fixed_point_stays_within_rounding_of_float(per_line):
+    config = TaxConfig()
+    df = items(500)
+    exact = TaxCalculator.calculate_taxes_frame(df, config)
+    fixed = TaxCalculator.calculate_taxes_frame(df, config, FixedPointConfig(per_line=per_line))
+    
+    # Até meio centavo por arredondamento, multiplicado pela quantidade nos totais
+    # (valores somam no máximo seis parcelas arredondadas)
+    tolerance = 6 * 0.005 * (df['Quantidade'].to_numpy() + 1)
+    for col in TaxCalculator.DERIVED_FORMULAS:
+        assert (np.abs(fixed[col] - exact[col]) <= tolerance).all(), col
@@ -0,0 +1,1001 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Dict, List, Optional, Set
+import decimal
+import locale
+from enum import Enum
+
+from data_model import DataModel
+from formatting import CellFormatter, format_number
+from tax_calculator import FixedPointConfig, ICMSRules, TaxCalculator
+
+# Configuração de locale para pt_BR
+def configure_locale():
+    try:
+        locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
+    except locale.Error:
+        try:
+            locale.setlocale(locale.LC_ALL, 'Portuguese_Brazil.1252')
+        except locale.Error:
+            print("Não foi possível configurar o locale para pt_BR. Usando padrão do sistema.")
+
+class ColorScheme(Enum):
+    PRIMARY = "#3498db"  # Azul mais vibrante
+    SECONDARY = "#2980b9"  # Azul mais escuro
+    ACCENT = "#2ecc71"  # Verde
+    BACKGROUND = "#f8f9fa"  # Cinza claro
+    TEXT = "#2c3e50"  # Azul escuro
+    SUCCESS = "#27ae60"  # Verde
+    WARNING = "#f39c12"  # Laranja
+    ERROR = "#e74c3c"  # Vermelho
+    LIGHT_GRAY = "#e0e0e0"  # Cinza claro
+    WHITE = "#ffffff"  # Branco
+    HIGHLIGHT = "#3498db"  # Azul
+    ROW_EVEN = "#f2f2f2"  # Cinza muito claro
+    ROW_ODD = "#ffffff"  # Branco
+    HEADER_BG = "#3498db"  # Azul para cabeçalhos
+    BORDER = "#d1d1d1"  # Cinza para bordas
+
+class Fonts(Enum):
+    TITLE = ("Segoe UI", 16, "bold")
+    HEADER = ("Segoe UI", 8, "bold")
+    BODY = ("Segoe UI", 9)
+    SMALL = ("Segoe UI", 9)
+    BUTTON = ("Segoe UI", 10, "bold")
+
+class ICMSEditorWindow:
+    # Opção do estado de origem que mantém apenas a alíquota interna do destino
+    DESTINATION_ONLY = "Somente destino"
+    
+    def __init__(self, parent, state_icms_table: Dict[str, float], update_callback,
+                 origin_state: Optional[str] = None, rules: Optional[ICMSRules] = None):
+        self.parent = parent
+        self.state_icms_table = state_icms_table.copy()
+        self.update_callback = update_callback
+        rules = rules or ICMSRules()
+        self.overrides = dict(rules.overrides)
+        
+        self.origin = tk.StringVar(value=origin_state or self.DESTINATION_ONLY)
+        self.difal = tk.BooleanVar(value=rules.difal)
+        self.imported = tk.BooleanVar(value=rules.imported)
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("Editar Tabela de ICMS por Estado")
+        self.window.geometry("700x650")
+        self.window.configure(bg=ColorScheme.BACKGROUND.value)
+        self.window.resizable(False, False)
+        
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        self.configure_styles()
+        self.create_widgets()
+        self.populate_table()
+    
+    def configure_styles(self) -> None:
+        self.style.configure("TFrame", background=ColorScheme.BACKGROUND.value)
+        self.style.configure("TButton", 
+                           font=Fonts.BUTTON.value,
+                           padding=8,
+                           background=ColorScheme.PRIMARY.value,
+                           foreground=ColorScheme.WHITE.value,
+                           borderwidth=0)
+        self.style.map("TButton",
+                      background=[('active', ColorScheme.SECONDARY.value)],
+                      relief=[('pressed', 'sunken'), ('!pressed', 'flat')])
+        
+        self.style.configure("Treeview", 
+                           font=Fonts.BODY.value,
+                           rowheight=30,
+                           background=ColorScheme.WHITE.value,
+                           fieldbackground=ColorScheme.WHITE.value,
+                           foreground=ColorScheme.TEXT.value,
+                           bordercolor=ColorScheme.BORDER.value,
+                           borderwidth=1)
+        self.style.configure("Treeview.Heading", 
+                           font=Fonts.HEADER.value,
+                           background=ColorScheme.HEADER_BG.value,
+                           foreground=ColorScheme.WHITE.value,
+                           relief="flat",
+                           padding=8)
+        self.style.map("Treeview",
+                      background=[('selected', ColorScheme.HIGHLIGHT.value)],
+                      foreground=[('selected', ColorScheme.WHITE.value)])
+    
+    def create_widgets(self) -> None:
+        self.main_frame = ttk.Frame(self.window, padding=15)
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Regras interestaduais: estado de origem, DIFAL e mercadoria importada
+        rules_frame = ttk.Frame(self.main_frame)
+        rules_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(rules_frame, text="Estado de origem:").pack(side=tk.LEFT)
+        origin_combo = ttk.Combobox(
+            rules_frame,
+            textvariable=self.origin,
+            values=[self.DESTINATION_ONLY] + sorted(self.state_icms_table),
+            state="readonly",
+            width=16
+        )
+        origin_combo.pack(side=tk.LEFT, padx=(5, 15))
+        origin_combo.bind("<<ComboboxSelected>>", lambda e: self.populate_table())
+        
+        ttk.Checkbutton(rules_frame, text="DIFAL (consumidor final)", variable=self.difal,
+                        command=self.populate_table).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(rules_frame, text="Mercadoria importada (4%)", variable=self.imported,
+                        command=self.populate_table).pack(side=tk.LEFT)
+        
+        # Frame para a Treeview e scrollbar
+        tree_frame = ttk.Frame(self.main_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+        
+        columns = ("Estado", "ICMS", "Interestadual", "DIFAL", "Efetiva")
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
+        self.tree.heading("Estado", text="Estado", anchor=tk.CENTER)
+        self.tree.heading("ICMS", text="ICMS Interno (%)", anchor=tk.CENTER)
+        self.tree.heading("Interestadual", text="Interestadual (%)", anchor=tk.CENTER)
+        self.tree.heading("DIFAL", text="DIFAL (%)", anchor=tk.CENTER)
+        self.tree.heading("Efetiva", text="Efetiva (%)", anchor=tk.CENTER)
+        for column in columns:
+            self.tree.column(column, width=120, anchor=tk.CENTER)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        # Empacotando Treeview e scrollbar
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Opção de reaplicar as alíquotas aos itens já cadastrados
+        self.reprice_items = tk.BooleanVar(value=False)
+        reprice_check = ttk.Checkbutton(
+            self.main_frame,
+            text="Reaplicar alíquotas alteradas aos itens existentes",
+            variable=self.reprice_items
+        )
+        reprice_check.pack(anchor=tk.W)
+        
+        # Botão de salvar
+        button_frame = ttk.Frame(self.main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        save_btn = ttk.Button(
+            button_frame, 
+            text="Salvar Alterações", 
+            command=self.save_changes
+        )
+        save_btn.pack(fill=tk.X)
+        
+        self.tree.bind('<Double-1>', self.edit_cell)
+    
+    def origin_state(self) -> Optional[str]:
+        origin = self.origin.get()
+        return None if origin == self.DESTINATION_ONLY else origin
+    
+    def rules(self) -> ICMSRules:
+        return ICMSRules(difal=self.difal.get(), imported=self.imported.get(), overrides=dict(self.overrides))
+    
+    def populate_table(self) -> None:
+        """Alíquotas de cada destino a partir da origem escolhida, pela mesma matriz do modelo"""
+        self.tree.delete(*self.tree.get_children())
+        states = sorted(self.state_icms_table)
+        origin = self.origin_state()
+        operation, difal = TaxCalculator.compile_icms_matrix(self.state_icms_table, self.rules(), states)
+        
+        for position, estado in enumerate(states):
+            internal = f"{self.state_icms_table[estado]:.2f}"
+            if origin is None:
+                values = (estado, internal, "", "", internal)
+            else:
+                route = (states.index(origin), position)
+                values = (estado, internal, f"{operation[route]:.2f}", f"{difal[route]:.2f}",
+                          f"{operation[route] + difal[route]:.2f}")
+            self.tree.insert("", tk.END, values=values, iid=estado)
+    
+    def edit_cell(self, event) -> None:
+        item = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x)
+        
+        # Interna (#2) sempre; interestadual (#3) apenas entre origem e outro destino
+        origin = self.origin_state()
+        if not item or column not in ('#2', '#3'):
+            return
+        if column == '#3' and (origin is None or origin == item):
+            return
+        
+        current_value = self.tree.set(item, "ICMS" if column == '#2' else "Interestadual")
+        
+        x, y, width, height = self.tree.bbox(item, column)
+        entry = ttk.Entry(self.tree, font=Fonts.BODY.value)
+        entry.place(x=x, y=y, width=width, height=height, anchor=tk.NW)
+        entry.insert(0, current_value)
+        entry.select_range(0, tk.END)
+        entry.focus()
+        
+        def save_edit():
+            try:
+                new_value = float(entry.get().replace(',', '.'))
+                if 0 <= new_value <= 100:
+                    if column == '#2':
+                        self.state_icms_table[item] = new_value
+                    else:
+                        self.overrides[ICMSRules.route(origin, item)] = new_value
+                    entry.destroy()
+                    self.populate_table()
+                else:
+                    messagebox.showerror("Erro", "O valor do ICMS deve estar entre 0 e 100%")
+            except ValueError:
+                messagebox.showerror("Erro", "Por favor, insira um valor numérico válido.")
+        
+        entry.bind("<FocusOut>", lambda e: save_edit())
+        entry.bind("<Return>", lambda e: save_edit())
+    
+    def save_changes(self) -> None:
+        if self.update_callback(self.state_icms_table, self.reprice_items.get(), self.origin_state(), self.rules()):
+            self.window.destroy()
+
+class BatchEditWindow:
+    """Janela para aplicar um mesmo valor de coluna a vários itens de uma vez"""
+    def __init__(self, parent, columns: List[str], states: List[str], selected_count: int, apply_callback):
+        self.parent = parent
+        self.columns = [col for col in columns if col != 'Item']
+        self.states = states
+        self.apply_callback = apply_callback
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("Aplicar Valor a Vários Itens")
+        self.window.geometry("480x300")
+        self.window.configure(bg=ColorScheme.BACKGROUND.value)
+        self.window.resizable(False, False)
+        
+        self.create_widgets(selected_count)
+    
+    def create_widgets(self, selected_count: int) -> None:
+        main_frame = ttk.Frame(self.window, padding=15)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.grid_columnconfigure(1, weight=1)
+        
+        ttk.Label(main_frame, text="Coluna:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        self.column_combo = ttk.Combobox(main_frame, values=self.columns, state="readonly")
+        self.column_combo.grid(row=0, column=1, columnspan=2, sticky=tk.EW, padx=5, pady=5)
+        
+        ttk.Label(main_frame, text="Novo valor:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        self.value_entry = ttk.Entry(main_frame)
+        self.value_entry.grid(row=1, column=1, columnspan=2, sticky=tk.EW, padx=5, pady=5)
+        
+        # Alvo: itens selecionados ou filtro por estado
+        self.target = tk.StringVar(value="selection" if selected_count else "filter")
+        ttk.Radiobutton(
+            main_frame,
+            text=f"Itens selecionados ({selected_count})",
+            variable=self.target,
+            value="selection",
+            state=tk.NORMAL if selected_count else tk.DISABLED
+        ).grid(row=2, column=0, columnspan=3, sticky=tk.W, padx=5, pady=(15, 5))
+        
+        ttk.Radiobutton(
+            main_frame,
+            text="Itens com Estado de Destino:",
+            variable=self.target,
+            value="filter"
+        ).grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
+        self.state_combo = ttk.Combobox(main_frame, values=self.states, width=5, state="readonly")
+        self.state_combo.grid(row=3, column=2, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Radiobutton(
+            main_frame,
+            text="Todos os itens",
+            variable=self.target,
+            value="all"
+        ).grid(row=4, column=0, columnspan=3, sticky=tk.W, padx=5, pady=5)
+        
+        apply_btn = ttk.Button(main_frame, text="Aplicar", command=self.apply, style="Accent.TButton")
+        apply_btn.grid(row=5, column=0, columnspan=3, sticky=tk.EW, pady=(15, 0))
+    
+    def apply(self) -> None:
+        column = self.column_combo.get()
+        if not column:
+            messagebox.showerror("Erro", "Selecione a coluna a ser alterada.", parent=self.window)
+            return
+        
+        where = None
+        if self.target.get() == "filter":
+            if not self.state_combo.get():
+                messagebox.showerror("Erro", "Selecione o estado do filtro.", parent=self.window)
+                return
+            where = {'Estado de Destino': self.state_combo.get()}
+        
+        if self.apply_callback(column, self.value_entry.get(), self.target.get(), where):
+            self.window.destroy()
+
+class MainView:
+    # Tabela virtualizada: apenas as linhas visíveis (mais uma pequena margem)
+    # existem na Treeview; o restante é preenchido conforme a rolagem
+    ROW_HEIGHT = 30
+    HEADER_HEIGHT = 60
+    OVERSCAN = 5
+    
+    TOTAL_CURRENCY_COLUMNS = [
+        "Valor Total de Custo (R$)", "Valor Total de Venda (R$)", 
+        "Valor Total ICMS (R$)", "Valor Total PIS (R$)", 
+        "Valor Total COFINS (R$)", "Valor Total IRPJ (R$)", 
+        "Valor Total CSLL (R$)", "Valor Total de impostos", 
+        "Valor Total"
+    ]
+    
+    def __init__(self, root, model: DataModel, controller):
+        self.root = root
+        self.model = model
+        self.controller = controller
+        self.first_row = 0
+        self.visible_rows = 20
+        # Seleção em índices de linha do modelo: sobrevive à rolagem, que recria a Treeview
+        self.selected_rows: Set[int] = set()
+        self.selection_anchor: Optional[int] = None
+        self.formatter = CellFormatter(self.model.columns)
+        self.configure_styles()
+        self.setup_ui()
+    
+    def configure_styles(self) -> None:
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        # Configuração geral
+        self.style.configure(".", 
+                           font=Fonts.BODY.value,
+                           background=ColorScheme.BACKGROUND.value,
+                           foreground=ColorScheme.TEXT.value)
+        
+        # Botões
+        self.style.configure("TButton", 
+                           font=Fonts.BUTTON.value,
+                           padding=8,
+                           background=ColorScheme.PRIMARY.value,
+                           foreground=ColorScheme.WHITE.value,
+                           borderwidth=0)
+        self.style.configure("Accent.TButton",
+                           background=ColorScheme.ACCENT.value)
+        self.style.map("TButton",
+                      background=[('active', ColorScheme.SECONDARY.value)],
+                      relief=[('pressed', 'sunken'), ('!pressed', 'flat')])
+        self.style.map("Accent.TButton",
+                     background=[('active', ColorScheme.SUCCESS.value)])
+        
+        # Labels
+        self.style.configure("TLabel", font=Fonts.BODY.value)
+        self.style.configure("Title.TLabel", 
+                           font=Fonts.TITLE.value,
+                           foreground=ColorScheme.WHITE.value,
+                           background=ColorScheme.PRIMARY.value,
+                           padding=5)
+        self.style.configure("Subtitle.TLabel",
+                           font=Fonts.HEADER.value,
+                           foreground=ColorScheme.PRIMARY.value)
+        
+        # Frames
+        self.style.configure("TFrame", background=ColorScheme.BACKGROUND.value)
+        self.style.configure("Header.TFrame", 
+                           background=ColorScheme.PRIMARY.value,
+                           borderwidth=0)
+        self.style.configure("TLabelframe", 
+                           background=ColorScheme.BACKGROUND.value,
+                           bordercolor=ColorScheme.BORDER.value,
+                           relief="solid",
+                           borderwidth=1)
+        self.style.configure("TLabelframe.Label", 
+                           font=Fonts.HEADER.value,
+                           foreground=ColorScheme.PRIMARY.value,
+                           background=ColorScheme.BACKGROUND.value)
+        
+        # Combobox
+        self.style.configure("TCombobox", 
+                           font=Fonts.BODY.value, 
+                           padding=6,
+                           fieldbackground=ColorScheme.WHITE.value,
+                           bordercolor=ColorScheme.BORDER.value)
+        self.style.map("TCombobox",
+                      fieldbackground=[('readonly', ColorScheme.WHITE.value)],
+                      selectbackground=[('readonly', ColorScheme.WHITE.value)])
+        
+        # Treeview
+        self.style.configure("Treeview", 
+                           font=Fonts.BODY.value,
+                           rowheight=30,
+                           background=ColorScheme.WHITE.value,
+                           fieldbackground=ColorScheme.WHITE.value,
+                           foreground=ColorScheme.TEXT.value,
+                           bordercolor=ColorScheme.BORDER.value)
+        self.style.configure("Treeview.Heading", 
+                           font=Fonts.HEADER.value,
+                           background=ColorScheme.HEADER_BG.value,
+                           foreground=ColorScheme.WHITE.value,
+                           relief="flat",
+                           padding=20,
+                           )
+        self.style.map("Treeview",
+                      background=[('selected', ColorScheme.HIGHLIGHT.value)],
+                      foreground=[('selected', ColorScheme.WHITE.value)])
+        
+        # Status bar
+        self.style.configure("Status.TFrame", background=ColorScheme.SECONDARY.value)
+        self.style.configure("Status.TLabel", 
+                           font=Fonts.SMALL.value,
+                           background=ColorScheme.SECONDARY.value,
+                           foreground=ColorScheme.WHITE.value,
+                           padding=5,
+                           relief=tk.SUNKEN)
+        
+        # Configurar padding e bordas
+        self.style.configure("TEntry", padding=6)
+    
+    def setup_ui(self) -> None:
+        self.root.title("Sistema de precificação - venda")
+        try:
+            self.root.state('zoomed')  # Windows e macOS
+        except tk.TclError:
+            # No X11 (Linux, xvfb-run) o estado 'zoomed' não existe; maximiza pelo atributo
+            try:
+                self.root.attributes('-zoomed', True)
+            except tk.TclError:
+                pass
+        self.root.configure(bg=ColorScheme.BACKGROUND.value)
+        
+        try:
+            self.root.iconbitmap("calculator_icon.ico")
+        except:
+            pass
+        
+        self.brazilian_states = list(self.model.state_icms_table.keys())
+        
+        self.create_header()
+        self.create_input_frame()
+        self.create_table_frame()
+        self.create_status_bar()
+        self.create_menu()
+        self.tree.bind('<Double-1>', self.controller.edit_cell)
+        
+        self.set_default_values()
+    
+    def create_header(self) -> None:
+        header_frame = ttk.Frame(self.root, style="Header.TFrame")
+        header_frame.pack(fill=tk.X)
+        
+        title_label = ttk.Label(
+            header_frame, 
+            text="Sistema de precificação - venda", 
+            style="Title.TLabel"
+        )
+        title_label.pack(side=tk.LEFT, padx=10)
+        
+        # Espaço flexível para alinhar elementos à direita se necessário
+        ttk.Frame(header_frame, style="Header.TFrame").pack(side=tk.LEFT, expand=True, fill=tk.X)
+    
+    def create_input_frame(self) -> None:
+        self.input_frame = ttk.LabelFrame(
+            self.root, 
+            text=" Adicionar Item ", 
+            padding=(15, 10),
+            style="TLabelframe"
+        )
+        self.input_frame.pack(fill=tk.X, padx=15, pady=(15, 10), ipady=5)
+        
+        # Configurar grid para campos de entrada
+        self.input_frame.grid_columnconfigure(1, weight=1)
+        self.input_frame.grid_columnconfigure(3, weight=1)
+        self.input_frame.grid_columnconfigure(5, minsize=20)  # Espaçamento entre colunas
+        
+        # Campos do lado esquerdo
+        left_fields = [
+            ("Descrição:", "description", 30),
+            ("Valor Unitário de Custo (R$):", "unit_cost", 15),
+            ("Quantidade:", "quantity", 10),
+            ("Margem de Lucro Bruto (%):", "profit_margin", 10),
+            ("Estado de Destino:", "state", 5)
+        ]
+        
+        # Campos do lado direito
+        right_fields = [
+            ("ICMS (%):", "icms", 10),
+            ("PIS (%):", "pis", 10),
+            ("COFINS (%):", "cofins", 10),
+            ("IRPJ (%):", "irpj", 10),
+            ("CSLL (%):", "csll", 10)
+        ]
+        
+        self.input_widgets = {}
+        
+        # Criar campos do lado esquerdo
+        for row, (label, name, width) in enumerate(left_fields):
+            lbl = ttk.Label(self.input_frame, text=label)
+            lbl.grid(row=row, column=0, sticky=tk.W, padx=5, pady=5)
+            
+            if name == "state":
+                widget = ttk.Combobox(self.input_frame, 
+                                    values=self.brazilian_states, 
+                                    width=width,
+                                    state="readonly")
+                widget.bind("<<ComboboxSelected>>", self.controller.update_icms_by_state)
+            else:
+                widget = ttk.Entry(self.input_frame, width=width)
+            
+            widget.grid(row=row, column=1, sticky=tk.EW, padx=5, pady=5)
+            self.input_widgets[name] = widget
+        
+        # Criar campos do lado direito
+        for row, (label, name, width) in enumerate(right_fields):
+            lbl = ttk.Label(self.input_frame, text=label)
+            lbl.grid(row=row, column=3, sticky=tk.W, padx=(15,5), pady=5)
+            
+            widget = ttk.Entry(self.input_frame, width=width)
+            widget.grid(row=row, column=4, sticky=tk.EW, padx=5, pady=5)
+            self.input_widgets[name] = widget
+        
+        # Frame para botões
+        button_frame = ttk.Frame(self.input_frame)
+        button_frame.grid(row=5, column=0, columnspan=5, pady=(10, 0), sticky=tk.EW)
+        
+        # Configurar grid para botões
+        button_frame.grid_columnconfigure(0, weight=1)
+        button_frame.grid_columnconfigure(1, weight=0)
+        button_frame.grid_columnconfigure(2, weight=0)
+        button_frame.grid_columnconfigure(3, weight=1)
+        
+        # Botão Adicionar Item
+        add_btn = ttk.Button(
+            button_frame, 
+            text="Adicionar Item", 
+            command=self.controller.add_item,
+            style="Accent.TButton"
+        )
+        add_btn.grid(row=0, column=1, padx=5, sticky=tk.EW)
+        
+        # Botão Excluir Item
+        delete_btn = ttk.Button(
+            button_frame, 
+            text="Excluir Item", 
+            command=self.controller.delete_selected,
+            style="TButton"
+        )
+        delete_btn.grid(row=0, column=2, padx=5, sticky=tk.EW)
+
+    def create_table_frame(self) -> None:
+        self.table_frame = ttk.LabelFrame(
+            self.root, 
+            text=" Itens da Planilha ", 
+            padding=(10, 5),
+            style="TLabelframe"
+        )
+        self.table_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 10))
+        
+        # Container para Treeview e scrollbars
+        container = ttk.Frame(self.table_frame)
+        container.pack(fill=tk.BOTH, expand=True)
+        
+        # Configurar grid no container
+        container.grid_rowconfigure(0, weight=1)
+        container.grid_columnconfigure(0, weight=1)
+        
+        # Criar Treeview
+        self.tree = ttk.Treeview(
+            container, 
+            columns=self.model.columns,
+            show="headings",
+            selectmode="extended",
+            style="Treeview"
+        )
+        
+        # Definir larguras das colunas
+        column_widths = {
+            "Item": 80,
+            "Descrição": 300,
+            "Valor Unitário de Custo (R$)": 200,
+            "Quantidade": 120,
+            "Valor Total de Custo (R$)": 190,
+            "Margem de Lucro Bruto (%)": 190,
+            "Valor Unitário de Venda (R$)": 200,
+            "Valor Total de Venda (R$)": 190,
+            "Estado de Destino": 140,
+            "ICMS (%)": 100,
+            "Valor unit. ICMS": 140,
+            "Valor Total ICMS (R$)": 160,
+            "PIS (%)": 100,
+            "Valor unit. PIS": 120,
+            "Valor Total PIS (R$)": 120,
+            "COFINS (%)": 110,
+            "Valor unit. COFINS": 150,
+            "Valor Total COFINS (R$)": 170,
+            "IRPJ (%)": 100,
+            "Valor unit. IRPJ": 120,
+            "Valor Total IRPJ (R$)": 150,
+            "CSLL (%)": 100,
+            "Valor unit. CSLL": 120,
+            "Valor Total CSLL (R$)": 170,
+            "Valor Total de impostos": 170,
+            "Valor Total Unitário": 150,
+            "Valor Total": 100,
+            "Total Alíquota Impostos (%)": 200
+        }
+        
+        # Configurar cabeçalhos e colunas
+        for col in self.model.columns:
+            self.tree.heading(col, text=col, anchor=tk.CENTER)
+            width = column_widths.get(col, 100)
+            self.tree.column(col, width=width, anchor=tk.CENTER, stretch=False)
+        
+        # Linha de totais fixa abaixo da tabela, fora da área rolável
+        self.totals_tree = ttk.Treeview(
+            container,
+            columns=self.model.columns,
+            show="",
+            height=1,
+            selectmode="none",
+            style="Treeview"
+        )
+        for col in self.model.columns:
+            self.totals_tree.column(col, width=column_widths.get(col, 100), anchor=tk.CENTER, stretch=False)
+        
+        # Scrollbars: a vertical percorre o DataFrame, não os itens da Treeview
+        self.vsb = ttk.Scrollbar(container, orient="vertical", command=self.on_vertical_scroll)
+        hsb = ttk.Scrollbar(container, orient="horizontal", command=self.on_horizontal_scroll)
+        
+        def sync_horizontal(first, last):
+            hsb.set(first, last)
+            self.totals_tree.xview_moveto(first)
+        
+        self.tree.configure(xscrollcommand=sync_horizontal)
+        
+        # Posicionar widgets no grid
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        self.totals_tree.grid(row=1, column=0, sticky="ew")
+        hsb.grid(row=2, column=0, sticky="ew")
+        
+        # Configurar tags para linhas alternadas e total
+        self.tree.tag_configure('evenrow', background=ColorScheme.ROW_EVEN.value)
+        self.tree.tag_configure('oddrow', background=ColorScheme.ROW_ODD.value)
+        self.totals_tree.tag_configure('total', 
+                              background=ColorScheme.LIGHT_GRAY.value, 
+                              font=Fonts.HEADER.value,
+                              foreground=ColorScheme.TEXT.value)
+        
+        # Bind para redimensionamento de colunas
+        def handle_column_resize(event):
+            column_id = self.tree.identify_column(event.x)
+            col_index = int(column_id[1:]) - 1
+            col_name = self.model.columns[col_index]
+            
+            bbox = self.tree.bbox(self.tree.identify_row(event.y), column_id)
+            if bbox:
+                new_width = max(20, event.x - bbox[0])
+                self.tree.column(col_name, width=new_width)
+                self.totals_tree.column(col_name, width=new_width)
+        
+        self.tree.bind("<B1-Motion>", handle_column_resize)
+        self.tree.bind("<ButtonRelease-1>", lambda e: self.tree.config(cursor=""))
+        self.tree.bind("<Button-1>", self.on_tree_click)
+        self.tree.bind("<Shift-Button-1>", lambda e: self.on_tree_click(e, 'range'))
+        self.tree.bind("<Control-Button-1>", lambda e: self.on_tree_click(e, 'toggle'))
+        
+        # Rolagem virtual
+        self.tree.bind("<Configure>", self.on_tree_resize)
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", self.on_mouse_wheel)
+        self.tree.bind("<Button-5>", self.on_mouse_wheel)
+        self.tree.bind("<Up>", self.on_key_navigation)
+        self.tree.bind("<Down>", self.on_key_navigation)
+        self.tree.bind("<Prior>", self.on_key_navigation)
+        self.tree.bind("<Next>", self.on_key_navigation)
+
+    def on_tree_click(self, event, mode: str = 'single') -> Optional[str]:
+        """Seleciona linhas do modelo: clique simples, intervalo (Shift) ou alternância (Ctrl)"""
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            self.start_column_resize(event)
+            return None
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return None
+        
+        row = int(item)
+        if mode == 'range' and self.selection_anchor is not None:
+            low, high = sorted((self.selection_anchor, row))
+            self.selected_rows = set(range(low, high + 1))
+        elif mode == 'toggle':
+            self.selected_rows ^= {row}
+            self.selection_anchor = row
+        else:
+            self.selected_rows = {row}
+            self.selection_anchor = row
+        
+        self.tree.focus_set()
+        self.tree.focus(item)
+        self.show_selection()
+        return "break"
+    
+    def select_rows(self, rows) -> None:
+        self.selected_rows = set(rows)
+        self.selection_anchor = min(self.selected_rows) if self.selected_rows else None
+        self.show_selection()
+    
+    def selected_row_indices(self) -> List[int]:
+        """Linhas selecionadas (índices do modelo), inclusive as fora da janela visível"""
+        return sorted(self.selected_rows)
+    
+    def show_selection(self) -> None:
+        """Reflete na janela materializada a seleção guardada em selected_rows"""
+        self.tree.selection_set([item for item in self.tree.get_children() if int(item) in self.selected_rows])
+    
+    def forget_shifted_selection(self, changes) -> None:
+        """Descarta a seleção quando inclusões ou exclusões deslocam os índices das linhas"""
+        if not self.selected_rows:
+            return
+        if changes.reset or changes.deleted or (changes.inserted and min(changes.inserted) <= max(self.selected_rows)):
+            self.selected_rows = set()
+            self.selection_anchor = None
+    
+    def start_column_resize(self, event):
+        region = self.tree.identify_region(event.x, event.y)
+        if region == "separator":
+            self.tree.config(cursor="sb_h_double_arrow")
+        else:
+            self.tree.config(cursor="")
+    
+    def create_status_bar(self) -> None:
+        status_frame = ttk.Frame(self.root, style="Status.TFrame")
+        status_frame.pack(fill=tk.X, padx=0, pady=0)
+        
+        self.status_bar = ttk.Label(
+            status_frame, 
+            text="Pronto", 
+            style="Status.TLabel",
+            anchor=tk.W
+        )
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Progresso e cancelamento de operações de arquivo (ocultos quando ociosos)
+        self.progress_bar = ttk.Progressbar(status_frame, orient=tk.HORIZONTAL, length=200,
+                                            mode='determinate', maximum=1.0)
+        self.cancel_button = ttk.Button(status_frame, text="Cancelar", command=self.controller.cancel_io_job)
+    
+    def show_progress(self, message: str) -> None:
+        self.status_bar.config(text=message)
+        self.progress_bar['value'] = 0.0
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+    
+    def set_progress(self, fraction: float) -> None:
+        self.progress_bar['value'] = fraction
+    
+    def hide_progress(self) -> None:
+        self.progress_bar.pack_forget()
+        self.cancel_button.pack_forget()
+    
+    def show_precision(self, fixed_point: Optional[FixedPointConfig]) -> None:
+        """Marca no menu o modo de cálculo em uso"""
+        if fixed_point is None:
+            self.precision_mode.set('float')
+        else:
+            self.precision_mode.set('line' if fixed_point.per_line else 'total')
+            self.rounding_mode.set(fixed_point.rounding)
+    
+    def create_menu(self) -> None:
+        menubar = tk.Menu(self.root, 
+                         bg=ColorScheme.BACKGROUND.value, 
+                         fg=ColorScheme.TEXT.value,
+                         activebackground=ColorScheme.PRIMARY.value,
+                         activeforeground=ColorScheme.WHITE.value)
+        
+        # Menu Arquivo
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Novo", command=self.controller.new_file, accelerator="Ctrl+N")
+        file_menu.add_command(label="Abrir", command=self.controller.open_file, accelerator="Ctrl+O")
+        file_menu.add_command(label="Salvar", command=self.controller.save_file, accelerator="Ctrl+S")
+        file_menu.add_command(label="Salvar Como", command=self.controller.save_file_as)
+        file_menu.add_command(label="Exportar Planilha...", command=self.controller.export_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Sair", command=self.controller.quit_application, accelerator="Alt+F4")
+        menubar.add_cascade(label="Arquivo", menu=file_menu)
+        
+        # Menu Editar
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label="Desfazer", command=self.controller.undo, accelerator="Ctrl+Z")
+        edit_menu.add_command(label="Refazer", command=self.controller.redo, accelerator="Ctrl+Y")
+        menubar.add_cascade(label="Editar", menu=edit_menu)
+        
+        # Menu Ações
+        action_menu = tk.Menu(menubar, tearoff=0)
+        action_menu.add_command(label="Limpar Planilha", command=self.controller.clear_spreadsheet)
+        action_menu.add_command(label="Excluir Item Selecionado", command=self.controller.delete_selected, accelerator="Del")
+        action_menu.add_command(label="Aplicar Valor a Vários Itens...", command=self.controller.batch_edit)
+        menubar.add_cascade(label="Ações", menu=action_menu)
+        
+        # Menu Configurações
+        config_menu = tk.Menu(menubar, tearoff=0)
+        config_menu.add_command(label="Editar Tabela de ICMS por Estado", command=self.controller.edit_icms_table)
+        
+        # Precisão do cálculo: ponto flutuante ou centavos inteiros
+        self.precision_mode = tk.StringVar(value='float')
+        self.rounding_mode = tk.StringVar(value=decimal.ROUND_HALF_EVEN)
+        precision_menu = tk.Menu(config_menu, tearoff=0)
+        for label, mode in [("Ponto flutuante", 'float'),
+                            ("Centavos, arredondando cada linha", 'line'),
+                            ("Centavos, arredondando só os totais", 'total')]:
+            precision_menu.add_radiobutton(label=label, variable=self.precision_mode, value=mode,
+                                           command=self.controller.change_precision)
+        precision_menu.add_separator()
+        for label, rounding in [("Arredondar metade para o par", decimal.ROUND_HALF_EVEN),
+                                ("Arredondar metade para cima", decimal.ROUND_HALF_UP)]:
+            precision_menu.add_radiobutton(label=label, variable=self.rounding_mode, value=rounding,
+                                           command=self.controller.change_precision)
+        config_menu.add_cascade(label="Precisão do Cálculo", menu=precision_menu)
+        menubar.add_cascade(label="Configurações", menu=config_menu)
+        
+        # Menu Informações
+        help_menu = tk.Menu(menubar, tearoff=0)
+        help_menu.add_command(label="Sobre", command=self.controller.show_about)
+        help_menu.add_command(label="Ajuda", command=self.controller.show_help)
+        menubar.add_cascade(label="Informações", menu=help_menu)
+        
+        self.root.config(menu=menubar)
+        
+        # Atalhos de teclado
+        self.root.bind("<Control-n>", lambda e: self.controller.new_file())
+        self.root.bind("<Control-o>", lambda e: self.controller.open_file())
+        self.root.bind("<Control-s>", lambda e: self.controller.save_file())
+        self.root.bind("<Delete>", lambda e: self.controller.delete_selected())
+        self.root.bind("<Control-z>", lambda e: self.controller.undo())
+        self.root.bind("<Control-y>", lambda e: self.controller.redo())
+        # Atalho oculto (sem item de menu) para o diagnóstico de desempenho
+        self.root.bind("<Control-Shift-F12>", lambda e: self.controller.toggle_instrumentation())
+    
+    def set_default_values(self) -> None:
+        self.input_widgets['unit_cost'].insert(0, "1,00")
+        self.input_widgets['quantity'].insert(0, "1,00")
+        self.input_widgets['profit_margin'].insert(0, "0,00")
+        self.input_widgets['state'].set("SP")
+        self.input_widgets['icms'].insert(0, format_number(self.model.tax_config.ICMS))
+        self.input_widgets['pis'].insert(0, format_number(self.model.tax_config.PIS))
+        self.input_widgets['cofins'].insert(0, format_number(self.model.tax_config.COFINS))
+        self.input_widgets['irpj'].insert(0, format_number(self.model.tax_config.IRPJ))
+        self.input_widgets['csll'].insert(0, format_number(self.model.tax_config.CSLL))
+    
+    def format_row(self, row) -> List[str]:
+        return self.formatter.format_row(row)
+    
+    def update_table(self) -> None:
+        self.forget_shifted_selection(self.model.consume_changes())
+        self.render_window()
+        self.update_totals_row()
+    
+    def apply_changes(self) -> None:
+        """Sincroniza a tabela apenas com as linhas alteradas no modelo"""
+        changes = self.model.consume_changes()
+        self.forget_shifted_selection(changes)
+        last_visible = self.first_row + self.visible_rows + self.OVERSCAN
+        
+        # Exclusões deslocam os índices seguintes: redesenha a janela visível
+        if changes.reset or changes.deleted or any(index < last_visible for index in changes.inserted):
+            self.render_window()
+        else:
+            if changes.inserted:
+                self.update_scrollbar()
+            # Apenas as linhas materializadas precisam ser redesenhadas
+            for item in self.tree.get_children():
+                if int(item) in changes.updated:
+                    self.update_row_in_table(int(item), item)
+        
+        if changes:
+            self.update_totals_row()
+    
+    def render_window(self) -> None:
+        """Materializa na Treeview apenas a janela de linhas visível"""
+        total_rows = self.model.row_count()
+        self.first_row = max(0, min(self.first_row, total_rows - self.visible_rows))
+        last_row = min(total_rows, self.first_row + self.visible_rows + self.OVERSCAN)
+        
+        self.tree.delete(*self.tree.get_children())
+        
+        # Formata a janela coluna a coluna em vez de linha a linha
+        rows = self.model.get_rows(self.first_row, last_row)
+        for index, values in zip(rows.index, self.formatter.format_frame(rows)):
+            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
+            self.tree.insert("", tk.END, values=values, iid=str(index), tags=(tag,))
+        
+        self.show_selection()
+        
+        self.tree.yview_moveto(0)
+        self.update_scrollbar()
+    
+    def update_scrollbar(self) -> None:
+        total_rows = self.model.row_count()
+        if total_rows:
+            self.vsb.set(self.first_row / total_rows, min(1.0, (self.first_row + self.visible_rows) / total_rows))
+        else:
+            self.vsb.set(0.0, 1.0)
+    
+    def update_totals_row(self) -> None:
+        self.totals_tree.delete(*self.totals_tree.get_children())
+        
+        totals = self.model.calculate_totals()
+        if totals:
+            formatted_totals = []
+            for col in self.model.columns:
+                value = totals.get(col, "")
+                
+                # Formatação especial para totais
+                if col in self.TOTAL_CURRENCY_COLUMNS:
+                    formatted_value = format_number(value) if value else ""
+                elif isinstance(value, (float, int)):
+                    formatted_value = format_number(value)
+                else:
+                    formatted_value = str(value)
+                
+                formatted_totals.append(formatted_value)
+            
+            self.totals_tree.insert("", tk.END, values=formatted_totals, tags=('total',))
+    
+    def scroll_to(self, first_row: int) -> None:
+        total_rows = self.model.row_count()
+        first_row = max(0, min(first_row, total_rows - self.visible_rows))
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.render_window()
+    
+    def on_vertical_scroll(self, *args) -> None:
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.model.row_count()))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_rows
+            self.scroll_to(self.first_row + step)
+    
+    def on_horizontal_scroll(self, *args) -> None:
+        self.tree.xview(*args)
+        self.totals_tree.xview(*args)
+    
+    def on_mouse_wheel(self, event) -> str:
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.scroll_to(self.first_row + step)
+        return "break"
+    
+    def on_key_navigation(self, event) -> Optional[str]:
+        children = self.tree.get_children()
+        if not children:
+            return None
+        
+        steps = {"Up": -1, "Down": 1, "Prior": -self.visible_rows, "Next": self.visible_rows}
+        step = steps[event.keysym]
+        focus = self.tree.focus()
+        position = children.index(focus) if focus in children else 0
+        target = self.first_row + position + step
+        
+        # A navegação altera selected_rows, não apenas a seleção da Treeview
+        target = max(0, min(target, self.model.row_count() - 1))
+        if target < self.first_row:
+            self.scroll_to(target)
+        elif target >= self.first_row + self.visible_rows:
+            self.scroll_to(target - self.visible_rows + 1)
+        
+        self.select_rows([target])
+        if self.tree.exists(str(target)):
+            self.tree.focus(str(target))
+        return "break"
+    
+    def on_tree_resize(self, event) -> None:
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        header_height = bbox[1] if bbox else self.HEADER_HEIGHT
+        visible_rows = max(1, (event.height - header_height) // self.ROW_HEIGHT)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render_window()
+    
+    def update_row_in_table(self, row_index: int, item: str) -> None:
+        if not self.tree.exists(item):
+            return  # Linha fora da janela visível
+        self.tree.item(item, values=self.format_row(self.model.get_rows(row_index, row_index + 1).iloc[0]))